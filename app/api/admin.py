@@ -0,0 +1,122 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from app.core.admission import read_limiter, write_limiter
+from app.core.cache import job_cache
+from app.core.config import settings
+from app.core.events import event_bus
+from app.core.profiling import ProfilerBusyError, format_collapsed, job_profiler, sampling_profiler
+from app.jobs.registry import JOB_REGISTRY
+
+router = APIRouter(prefix="/admin")
+
+
+@router.get(
+    "/cache",
+    summary="Job cache statistics",
+    description="Hit/miss counters, hit ratio and entry count of the `GET /jobs/{job_id}` response cache."
+)
+def cache_stats():
+    return job_cache.stats()
+
+
+@router.get(
+    "/admission",
+    summary="Admission control state",
+    description="Current adaptive limit, in-flight and queued requests, and shed counts for reads and mutations."
+)
+def admission_stats():
+    return {"read": read_limiter.stats(), "mutation": write_limiter.stats()}
+
+
+@router.get(
+    "/events",
+    summary="Event stream state",
+    description="Last published offset, buffered events, open subscribers and subscribers dropped for falling behind."
+)
+def event_stats():
+    return event_bus.stats()
+
+
+@router.get(
+    "/profile/sample",
+    summary="Capture a sampling profile",
+    description="Sample the stacks of every thread (API requests and job workers) for `seconds` and return them "
+                "as collapsed stacks (`frame;frame;frame count`), ready for flamegraph.pl or speedscope. "
+                "Only one capture runs at a time; a concurrent request gets `409`.",
+    response_class=PlainTextResponse,
+)
+def sample_profile(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+):
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.PROFILE_MAX_SECONDS}")
+    try:
+        stacks = sampling_profiler.capture(seconds, interval=interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(
+        format_collapsed(stacks),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+    )
+
+
+@router.get(
+    "/profile/jobs",
+    summary="Job profiling summary",
+    description="Per `function_name`: whether cProfile is on, whether a pstats profile is available, "
+                "and per-stage timings (`total` plus any stages the function reports)."
+)
+def job_profile_summary():
+    return job_profiler.summary()
+
+
+def _registered(function_name: str):
+    if function_name not in JOB_REGISTRY:
+        raise HTTPException(status_code=404, detail=f"Unknown function {function_name}")
+
+
+@router.put(
+    "/profile/jobs/{function_name}",
+    summary="Enable cProfile for a job function",
+    description="Run every execution of `function_name` under cProfile and merge the results."
+)
+def enable_job_profile(function_name: str):
+    _registered(function_name)
+    job_profiler.enable(function_name)
+    return job_profiler.summary()[function_name]
+
+
+@router.delete(
+    "/profile/jobs/{function_name}",
+    summary="Disable cProfile for a job function",
+    description="Stop profiling `function_name` and discard its collected profile and stage timings."
+)
+def disable_job_profile(function_name: str):
+    _registered(function_name)
+    job_profiler.disable(function_name)
+    job_profiler.reset(function_name)
+    return {"message": f"Profiling disabled for {function_name}"}
+
+
+@router.get(
+    "/profile/jobs/{function_name}/pstats",
+    summary="Download a job function's profile",
+    description="The merged cProfile data as a pstats file (load with `pstats.Stats(path)` or snakeviz). "
+                "`?format=text` returns the top functions by cumulative time instead."
+)
+def download_job_profile(function_name: str, format: str = Query("pstats", pattern="^(pstats|text)$")):
+    if format == "text":
+        text = job_profiler.pstats_text(function_name)
+        if text is None:
+            raise HTTPException(status_code=404, detail=f"No profile collected for {function_name}")
+        return PlainTextResponse(text)
+    data = job_profiler.pstats_bytes(function_name)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"No profile collected for {function_name}")
+    return Response(
+        data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{function_name}.pstats"'},
+    )
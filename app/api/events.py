@@ -0,0 +1,81 @@
+import time
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import EVENT_TYPES, CursorExpiredError, SubscriberDroppedError, event_bus
+
+router = APIRouter()
+
+
+def format_sse(event: dict) -> bytes:
+    return (
+        f"id: {event['offset']}\nevent: {event['type']}\ndata: ".encode()
+        + orjson.dumps(event)
+        + b"\n\n"
+    )
+
+
+async def _stream(subscription):
+    deadline = time.monotonic() + settings.EVENTS_MAX_STREAM_SECONDS
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = await subscription.next(timeout=min(settings.EVENTS_KEEPALIVE_SECONDS, remaining))
+            except SubscriberDroppedError:
+                yield b'event: dropped\ndata: {"detail": "Subscriber fell behind; resume from the last id"}\n\n'
+                return
+            if event is not None:
+                yield format_sse(event)
+            elif subscription.closed:
+                return
+            else:
+                yield b": keepalive\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get(
+    "/events",
+    summary="Stream job events",
+    description="Server-sent events for job changes (`job.created`, `job.updated`, `job.deleted`, `jobs.deleted`) "
+                "and executions (`job.executed`, `job.failed`). Filter with `?types=` (comma separated) and `?job_id=`. "
+                "Each event's `id` is its offset: reconnect with `Last-Event-ID` (or `?after=`) to resume. "
+                "Returns `410` when that offset is no longer buffered. Slow consumers get a `dropped` event and are disconnected.",
+    response_class=StreamingResponse,
+)
+async def stream_events(
+    types: Optional[str] = Query(None),
+    job_id: Optional[str] = Query(None),
+    after: Optional[int] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+):
+    type_filter = None
+    if types:
+        type_filter = {t.strip() for t in types.split(",") if t.strip()}
+        unknown = type_filter.difference(EVENT_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(sorted(unknown))}")
+
+    if after is None and last_event_id:
+        try:
+            after = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    try:
+        subscription = event_bus.subscribe(types=type_filter, job_id=job_id, after=after)
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+    return StreamingResponse(
+        _stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
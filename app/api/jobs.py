@@ -1,70 +1,131 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.api.responses import negotiate
+from app.core.cache import job_cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.dependencies import dependency_graph, find_cycle, load_dependency_edges
+from app.core.events import JOB_CREATED, JOB_DELETED, JOB_UPDATED, JOBS_DELETED, event_bus
 from app.core.logger import safe_log
+from app.core.metadata_query import metadata_filter_clauses, metadata_filters_from_query
+from app.core.ready_queue import QueueFullError
 from app.core.scheduler import scheduler_manager
-from app.jobs.registry import JOB_REGISTRY
-from app.models.job import Job, JobStatus
-from app.schemas.job import JobCreate, JobUpdate
+from app.jobs.registry import JOB_REGISTRY, JobNotAllowedError
+from app.models.job import Job, JobStatus, job_dependencies
+from app.schemas.job import (
+    JobCreate,
+    JobDeleted,
+    JobGraph,
+    JobRead,
+    JobRunQueued,
+    JobsDeleted,
+    JobUpdate,
+    serialize_job,
+    serialize_jobs,
+)
 
 router = APIRouter()
 
 
+def apply_dependencies(db: Session, job: Job, upstream_ids):
+    """Make ``job`` depend on ``upstream_ids`` after checking they exist and form no cycle."""
+    wanted = {str(upstream) for upstream in upstream_ids}
+    if not wanted:
+        job.upstream_jobs = []
+        return
+    upstream_jobs = db.query(Job).filter(Job.id.in_([uuid.UUID(u) for u in wanted])).all()
+    missing = wanted - {str(upstream.id) for upstream in upstream_jobs}
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown dependencies: {', '.join(sorted(missing))}")
+    if job.id is not None:
+        cycle = find_cycle(load_dependency_edges(db), str(job.id), wanted)
+        if cycle:
+            raise HTTPException(status_code=400, detail=f"Dependency cycle: {' -> '.join(cycle)}")
+    job.upstream_jobs = upstream_jobs
+
+
 @router.get(
     "/jobs",
     summary="List all jobs",
-    description="Returns a list of all scheduled jobs including their details such as name, interval, status, and metadata."
+    description="Returns a list of all scheduled jobs including their details such as name, interval, status, and metadata. "
+                "Filter on metadata with `?meta.<key>=<value>` (e.g. `?meta.tenant=acme`); multiple keys are combined with AND. "
+                "Send `Accept: application/msgpack` for a msgpack body.",
+    response_model=list[JobRead],
 )
-def list_jobs(db: Session = Depends(get_db)):
-    return db.query(Job).all()
+def list_jobs(request: Request, db: Session = Depends(get_db)):
+    try:
+        filters = metadata_filters_from_query(request.query_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    clauses = metadata_filter_clauses(
+        db.get_bind().dialect.name, filters, settings.JOB_METADATA_INDEXED_KEYS
+    )
+    # Plain rows skip ORM identity-map bookkeeping for every job in the table
+    rows = db.execute(select(Job.__table__).where(*clauses)).all()
+    return negotiate(request, serialize_jobs(rows, load_dependency_edges(db)))
 
 
 @router.get(
     "/jobs/{job_id}",
     summary="Get job details",
-    description="Fetch details of a specific job by its UUID. Includes scheduling information and metadata."
+    description="Fetch details of a specific job by its UUID. Includes scheduling information and metadata.",
+    response_model=JobRead,
 )
-def get_job(job_id: str, db: Session = Depends(get_db)):
+def get_job(job_id: str, request: Request, db: Session = Depends(get_db)):
     try:
         job_uuid = uuid.UUID(job_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid job ID format")
 
+    cache_key = str(job_uuid)
+    cached = job_cache.get(cache_key)
+    if cached is not None:
+        return negotiate(request, cached)
+
+    token = job_cache.begin_read(cache_key)
     job = db.query(Job).filter(Job.id == job_uuid).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    payload = serialize_job(job)
+    job_cache.set(cache_key, payload, token)
+    return negotiate(request, payload)
 
 
 @router.post(
     "/jobs",
     summary="Create a new job",
     description="Create a new job with a name, interval, metadata, and status. "
-                "Jobs are scheduled immediately if set to `active`."
+                "Jobs are scheduled immediately if set to `active`.",
+    response_model=JobRead,
 )
-def create_job(job_in: JobCreate, db: Session = Depends(get_db)):
+def create_job(job_in: JobCreate, request: Request, db: Session = Depends(get_db)):
     job = Job(
         name=job_in.name,
         function_name=job_in.function_name,
         interval_seconds=job_in.interval_seconds,
         cron_expression=job_in.cron_expression,
+        run_at=job_in.run_at,
         job_metadata=job_in.job_metadata,
         status=job_in.status or JobStatus.ACTIVE,
     )
     
-    func = JOB_REGISTRY.get(job.function_name)
-    if not func:
+    # Membership only: job modules are imported when a function first runs, not here
+    if job.function_name not in JOB_REGISTRY:
         raise HTTPException(status_code=400, detail=f"Unknown function {job.function_name}")
+    apply_dependencies(db, job, job_in.depends_on)
 
     db.add(job)
     db.commit()
     db.refresh(job)
+    job_cache.invalidate(str(job.id))
     
     trigger = job.get_trigger()
-    if not trigger:
+    if not trigger and not job_in.depends_on:
         raise HTTPException(status_code=400, detail="Invalid schedule")
 
     if job.status == JobStatus.ACTIVE:
@@ -72,16 +133,19 @@ def create_job(job_in: JobCreate, db: Session = Depends(get_db)):
         safe_log(f"Job {job.id} created and scheduled")
     else:
         safe_log(f"Job {job.id} created but not active, skipping scheduling")
-    return job
+    payload = serialize_job(job)
+    event_bus.publish(JOB_CREATED, payload["id"], payload)
+    return negotiate(request, payload)
 
 
 @router.put(
     "/jobs/{job_id}",
     summary="Replace a job",
     description="Completely replace a job definition. "
-                "All fields must be provided. Missing fields will be reset."
+                "All fields must be provided. Missing fields will be reset.",
+    response_model=JobRead,
 )
-def replace_job(job_id: str, job_in: JobCreate, db: Session = Depends(get_db)):
+def replace_job(job_id: str, job_in: JobCreate, request: Request, db: Session = Depends(get_db)):
     try:
         job_uuid = uuid.UUID(job_id)
     except ValueError:
@@ -95,19 +159,23 @@ def replace_job(job_id: str, job_in: JobCreate, db: Session = Depends(get_db)):
     job.function_name=job_in.function_name
     job.interval_seconds = job_in.interval_seconds
     job.cron_expression = job_in.cron_expression
+    job.run_at = job_in.run_at
     job.job_metadata = job_in.job_metadata
     job.status = job_in.status
+    job.next_run_at = job.compute_next_run()
     
-    func = JOB_REGISTRY.get(job.function_name)
-    if not func:
+    if job.function_name not in JOB_REGISTRY:
         raise HTTPException(status_code=400, detail=f"Unknown function {job.function_name}")
+    apply_dependencies(db, job, job_in.depends_on)
 
     trigger = job.get_trigger()
-    if not trigger:
+    if not trigger and not job_in.depends_on:
         raise HTTPException(status_code=400, detail="Invalid schedule")
 
     scheduler_manager.remove_existing_job(job)
     db.commit()
+    job_cache.invalidate(str(job_uuid))
+    scheduler_manager.reset_dependency_progress(str(job_uuid))
 
     # Reschedule only if active
     if job.status == JobStatus.ACTIVE:
@@ -115,16 +183,19 @@ def replace_job(job_id: str, job_in: JobCreate, db: Session = Depends(get_db)):
         safe_log(f"Job {job.id} replaced and scheduled")
     else:
         safe_log(f"Job {job.id} replaced but not active, skipping scheduling")
-    return job
+    payload = serialize_job(job)
+    event_bus.publish(JOB_UPDATED, payload["id"], payload)
+    return negotiate(request, payload)
 
 
 @router.patch(
     "/jobs/{job_id}",
     summary="Update job (partial)",
     description="Update one or more fields of a job (e.g., name, interval, metadata, status). "
-                "Fields not provided remain unchanged."
+                "Fields not provided remain unchanged.",
+    response_model=JobRead,
 )
-def patch_job(job_id: str, job_in: JobUpdate, db: Session = Depends(get_db)):
+def patch_job(job_id: str, job_in: JobUpdate, request: Request, db: Session = Depends(get_db)):
     try:
         job_uuid = uuid.UUID(job_id)
     except ValueError:
@@ -141,24 +212,35 @@ def patch_job(job_id: str, job_in: JobUpdate, db: Session = Depends(get_db)):
     if job_in.interval_seconds is not None:
         job.interval_seconds = job_in.interval_seconds
         job.cron_expression = None
+        job.run_at = None
     if job_in.cron_expression is not None:
         job.cron_expression = job_in.cron_expression
         job.interval_seconds = None
+        job.run_at = None
+    if job_in.run_at is not None:
+        job.run_at = job_in.run_at
+        job.interval_seconds = None
+        job.cron_expression = None
     if job_in.job_metadata is not None:
         job.job_metadata = job_in.job_metadata
     if job_in.status is not None:
         job.status = job_in.status
+    job.next_run_at = job.compute_next_run()
         
-    func = JOB_REGISTRY.get(job.function_name)
-    if not func:
+    if job.function_name not in JOB_REGISTRY:
         raise HTTPException(status_code=400, detail=f"Unknown function {job.function_name}")
+    if job_in.depends_on is not None:
+        apply_dependencies(db, job, job_in.depends_on)
         
     trigger = job.get_trigger()
-    if not trigger:
+    if not trigger and not job.upstream_jobs:
         raise HTTPException(status_code=400, detail="Invalid schedule")
     
     scheduler_manager.remove_existing_job(job)
     db.commit()
+    job_cache.invalidate(str(job_uuid))
+    if job_in.depends_on is not None:
+        scheduler_manager.reset_dependency_progress(str(job_uuid))
     
     # Reschedule if active
     if job.status == JobStatus.ACTIVE:
@@ -166,7 +248,60 @@ def patch_job(job_id: str, job_in: JobUpdate, db: Session = Depends(get_db)):
         safe_log(f"Job {job.id} updated and scheduled")
     else:
         safe_log(f"Job {job.id} updated but not active, skipping scheduling")
-    return job
+    payload = serialize_job(job)
+    event_bus.publish(JOB_UPDATED, payload["id"], payload)
+    return negotiate(request, payload)
+
+
+@router.get(
+    "/jobs/{job_id}/graph",
+    summary="Get a job's dependency graph",
+    description="Every job upstream and downstream of this one, with `upstream -> downstream` edges. "
+                "A job runs once all of its upstream jobs have succeeded since its last dependency-triggered run.",
+    response_model=JobGraph,
+)
+def get_job_graph(job_id: str, request: Request, db: Session = Depends(get_db)):
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    if db.query(Job.id).filter(Job.id == job_uuid).first() is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return negotiate(request, dependency_graph(db, str(job_uuid)))
+
+
+@router.post(
+    "/jobs/{job_id}/run",
+    summary="Run a job now",
+    description="Queue an immediate execution of the job's function with its metadata, outside its schedule. "
+                "The job's own schedule and status are unchanged. Returns `503` when the ready queue is full.",
+    status_code=202,
+    response_model=JobRunQueued,
+)
+def run_job_now(job_id: str, request: Request, db: Session = Depends(get_db)):
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+
+    cache_key = str(job_uuid)
+    job = job_cache.get(cache_key)
+    if job is None:
+        row = db.query(Job).filter(Job.id == job_uuid).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job = {"function_name": row.function_name, "job_metadata": row.job_metadata}
+
+    if job["function_name"] not in JOB_REGISTRY:
+        raise HTTPException(status_code=400, detail=f"Unknown function {job['function_name']}")
+
+    try:
+        scheduler_manager.run_now(cache_key, job["function_name"], job["job_metadata"])
+    except JobNotAllowedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return negotiate(request, {"job_id": cache_key, "status": "queued"}, status_code=202)
 
 
 @router.delete(
@@ -174,7 +309,8 @@ def patch_job(job_id: str, job_in: JobUpdate, db: Session = Depends(get_db)):
     summary="Delete a single job",
     description=" Permanently delete a single job by UUID. "
                 "Removes it from both the database and the scheduler. "
-                "Requires `?confirm=true` query parameter."
+                "Requires `?confirm=true` query parameter.",
+    response_model=JobDeleted,
 )
 def delete_job(job_id: str, confirm: bool = Query(False), db: Session = Depends(get_db)):
     if not confirm:
@@ -191,9 +327,16 @@ def delete_job(job_id: str, confirm: bool = Query(False), db: Session = Depends(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    downstream_ids = [str(downstream.id) for downstream in job.downstream_jobs]
     scheduler_manager.remove_existing_job(job)
     db.delete(job)
     db.commit()
+    job_cache.invalidate(str(job_uuid))
+    scheduler_manager.forget_dependencies(str(job_uuid))
+    # Downstream jobs lose this dependency, so their cached depends_on is stale
+    for downstream_id in downstream_ids:
+        job_cache.invalidate(downstream_id)
+    event_bus.publish(JOB_DELETED, str(job_uuid))
     return {"message": f"Job {job_id} deleted successfully"}
 
 
@@ -202,14 +345,18 @@ def delete_job(job_id: str, confirm: bool = Query(False), db: Session = Depends(
     summary="Delete all jobs",
     description=" Permanently delete **all jobs** from the system. "
                 "Removes them from both the database and the scheduler. "
-                "Requires `?confirm=true` query parameter."
+                "Requires `?confirm=true` query parameter.",
+    response_model=JobsDeleted,
 )
 def delete_all_jobs(confirm: bool = Query(False), db: Session = Depends(get_db)):
     if not confirm:
         raise HTTPException(status_code=400, detail="Confirmation required (?confirm=true)")
 
-    scheduler_manager.scheduler.remove_all_jobs()
+    scheduler_manager.remove_all_jobs()
+    db.execute(delete(job_dependencies))
     deleted_count = db.query(Job).delete()
     db.commit()
+    job_cache.clear()
+    event_bus.publish(JOBS_DELETED, data={"deleted_count": deleted_count})
     safe_log(f"All jobs deleted (including paused ones). Total: {deleted_count}")
     return {"message": "All jobs deleted successfully", "deleted_count": deleted_count}
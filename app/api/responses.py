@@ -0,0 +1,54 @@
+import msgpack
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class MsgPackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def _accept_quality(accept: str):
+    """Yield ``(media_type, q)`` pairs from an ``Accept`` header."""
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        yield media_type.strip().lower(), quality
+
+
+def wants_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept")
+    if not accept:
+        return False
+    msgpack_q = json_q = 0.0
+    msgpack_first = None
+    for media_type, quality in _accept_quality(accept):
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, quality)
+            if msgpack_first is None:
+                msgpack_first = True
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_q = max(json_q, quality)
+            if msgpack_first is None:
+                msgpack_first = False
+    # Equal quality goes to whichever type the client listed first
+    return msgpack_q > json_q or bool(msgpack_q == json_q > 0 and msgpack_first)
+
+
+def negotiate(request: Request, content, status_code: int = 200) -> Response:
+    """Render already-serialized ``content`` as msgpack or JSON based on ``Accept``."""
+    if wants_msgpack(request):
+        return MsgPackResponse(content, status_code=status_code)
+    return ORJSONResponse(content, status_code=status_code)
@@ -0,0 +1,225 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(self, loop, future):
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit with a bounded FIFO wait queue and an AIMD-adjusted limit.
+
+    Each completed request reports its latency. Latencies above
+    ``latency_target`` shrink the limit by ``backoff`` (at most once per target
+    interval); faster ones grow it by roughly one slot per ``limit``
+    completions. When every slot is busy a request waits up to ``queue_timeout``
+    seconds. It gets 429 if the queue is already full and 503 if the wait times out.
+
+    The state sits behind a thread lock and waiters are woken on their own loop,
+    so one limiter can be shared by requests running on different event loops.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        latency_target: float,
+        backoff: float = 0.9,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.clock = clock
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        self._last_decrease = float("-inf")
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    async def acquire(self):
+        """Wait for a slot; raises ``AdmissionRejected`` when the request is shed."""
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                self.admitted += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    429, f"Too many concurrent {self.name} requests", self._retry_after()
+                )
+            loop = asyncio.get_running_loop()
+            waiter = _Waiter(loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    self.timed_out += 1
+                    raise AdmissionRejected(
+                        503, f"Timed out waiting for a {self.name} slot", self._retry_after()
+                    ) from None
+            # The slot was handed over just as the wait ended: keep it, or give it back on cancel
+            if isinstance(e, asyncio.CancelledError):
+                self.release(None)
+                raise
+        with self._lock:
+            self.admitted += 1
+
+    def release(self, latency: float = None):
+        """Free a slot and feed ``latency`` (seconds) into the limit."""
+        with self._lock:
+            self._in_flight -= 1
+            if latency is not None:
+                self._record(latency)
+            self._grant_waiters()
+
+    def _record(self, latency: float):
+        if latency > self.latency_target:
+            now = self.clock()
+            if now - self._last_decrease >= self.latency_target:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                self._last_decrease = now
+        else:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _grant_waiters(self):
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # The waiter's loop is gone; nobody is left to take the slot
+                continue
+            waiter.granted = True
+            self._in_flight += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that admits reads and mutations through separate limiters
+    and sheds the rest with 429/503 and ``Retry-After``.
+    """
+
+    def __init__(self, app, read_limiter: AdaptiveLimiter, write_limiter: AdaptiveLimiter, exempt_paths=()):
+        self.app = app
+        self.read_limiter = read_limiter
+        self.write_limiter = write_limiter
+        self.exempt_paths = tuple(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.read_limiter if scope["method"] in READ_METHODS else self.write_limiter
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as e:
+            response = ORJSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started)
+
+
+read_limiter = AdaptiveLimiter(
+    "read",
+    initial_limit=settings.ADMISSION_READ_LIMIT,
+    min_limit=settings.ADMISSION_MIN_LIMIT,
+    max_limit=settings.ADMISSION_READ_MAX_LIMIT,
+    max_queue=settings.ADMISSION_QUEUE_SIZE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    latency_target=settings.ADMISSION_READ_LATENCY_TARGET_SECONDS,
+)
+write_limiter = AdaptiveLimiter(
+    "mutation",
+    initial_limit=settings.ADMISSION_WRITE_LIMIT,
+    min_limit=settings.ADMISSION_MIN_LIMIT,
+    max_limit=settings.ADMISSION_WRITE_MAX_LIMIT,
+    max_queue=settings.ADMISSION_QUEUE_SIZE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    latency_target=settings.ADMISSION_WRITE_LATENCY_TARGET_SECONDS,
+)
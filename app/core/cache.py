@@ -0,0 +1,234 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import safe_log
+
+
+class CacheBackend:
+    """Storage for serialized job payloads keyed by job id."""
+
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        return 0
+
+
+class LocalLRUBackend(CacheBackend):
+    """Bounded in-process cache with per-entry TTL and LRU eviction."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FakeSharedBackend(CacheBackend):
+    """
+    Stand-in for a shared cache server. Pass the same ``store`` dict to several
+    instances to simulate replicas talking to one server.
+    """
+
+    def __init__(self, ttl_seconds: float, store: dict = None, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.store = store if store is not None else {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is None:
+                return None
+            expires_at, raw = entry
+            if expires_at <= self.clock():
+                del self.store[key]
+                return None
+        return json.loads(raw)
+
+    def set(self, key, value):
+        raw = json.dumps(value)
+        with self._lock:
+            self.store[key] = (self.clock() + self.ttl_seconds, raw)
+
+    def delete(self, key):
+        with self._lock:
+            self.store.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.store.clear()
+
+    def __len__(self):
+        return len(self.store)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache on Redis so invalidations are seen by every replica."""
+
+    def __init__(self, url: str, ttl_seconds: float, prefix: str = "scheduler:job:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("JOB_CACHE_BACKEND_URL points at Redis but 'redis' is not installed") from e
+        self.client = redis.Redis.from_url(url)
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), px=self.ttl_ms)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class JobCache:
+    """
+    Read-through cache of serialized job responses with hit/miss accounting.
+
+    Readers take a token with :meth:`begin_read` before querying the database
+    and pass it to :meth:`set`; an invalidation in between makes the write a
+    no-op so a slow reader cannot put back a stale payload.
+    """
+
+    _STRIPES = 1024
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generations = [0] * self._STRIPES
+        self._lock = threading.Lock()
+
+    def _stripe(self, key: str) -> int:
+        return hash(key) % self._STRIPES
+
+    def begin_read(self, key: str) -> int:
+        return self._generations[self._stripe(key)]
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            safe_log(f"Job cache read failed for {key}: {e}", level=logging.WARNING)
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict, token: int = None):
+        if not self.enabled:
+            return
+        if token is not None and token != self._generations[self._stripe(key)]:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            safe_log(f"Job cache write failed for {key}: {e}", level=logging.WARNING)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._generations[self._stripe(key)] += 1
+            self.invalidations += 1
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            safe_log(f"Job cache invalidation failed for {key}: {e}", level=logging.WARNING)
+
+    def clear(self):
+        with self._lock:
+            self._generations = [generation + 1 for generation in self._generations]
+            self.invalidations += 1
+        try:
+            self.backend.clear()
+        except Exception as e:
+            safe_log(f"Job cache clear failed: {e}", level=logging.WARNING)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_backend(url: Optional[str]) -> CacheBackend:
+    ttl = settings.JOB_CACHE_TTL_SECONDS
+    if not url:
+        return LocalLRUBackend(settings.JOB_CACHE_MAX_ENTRIES, ttl)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisCacheBackend(url, ttl)
+    if url == "fake://":
+        return FakeSharedBackend(ttl)
+    raise ValueError(f"Unsupported JOB_CACHE_BACKEND_URL '{url}'")
+
+
+# Singleton instance for global use
+job_cache = JobCache(build_backend(settings.JOB_CACHE_BACKEND_URL), enabled=settings.JOB_CACHE_ENABLED)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -7,7 +9,55 @@ class Settings(BaseSettings):
     ENV: str = "development"  # "development" or "production"
     DATABASE_URL: str = "sqlite:///./scheduler.db"
     LOG_LEVEL: str = "DEBUG"
+    LOG_FILE: str = "scheduler.log"  # rotated at 5 MB, 3 backups kept
     SCHEDULER_JOB_DEFAULTS: dict = {"coalesce": True, "max_instances": 1}
+    SCHEDULER_ENGINE: str = "apscheduler"  # "apscheduler" or "timing_wheel"
+    SCHEDULER_MAX_WORKERS: int = 10
+    TIMING_WHEEL_TICK_SECONDS: float = 0.1
+    TIMING_WHEEL_SLOTS: int = 512
+    TIMING_WHEEL_LEVELS: int = 4
+    READY_QUEUE_MAX_SIZE: int = 100_000  # pending one-shot and "run now" executions
+    READY_QUEUE_MAX_WORKERS: int = 10
+    JOB_CACHE_ENABLED: bool = True
+    JOB_CACHE_MAX_ENTRIES: int = 10000
+    JOB_CACHE_TTL_SECONDS: float = 30.0
+    JOB_CACHE_BACKEND_URL: Optional[str] = None  # e.g. "redis://cache:6379/0" to share across replicas
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # durable across app crashes in WAL mode; FULL also survives power loss
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # how long a connection waits for the write lock
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_WRITER_ENABLED: bool = True  # funnel bookkeeping writes through one group-committing thread
+    SQLITE_WRITER_MAX_BATCH: int = 256
+    SQLITE_WRITER_MAX_DELAY_SECONDS: float = 0.002  # how long a batch waits for more writes
+    SHUTDOWN_GRACE_SECONDS: float = 25.0  # how long shutdown waits for in-flight executions
+    SCHEDULER_LEASE_ENABLED: bool = True  # only the lease holder fires scheduled jobs
+    SCHEDULER_LEASE_NAME: str = "scheduler"  # per worker group; also names its apscheduler_jobs table
+    SCHEDULER_LEASE_TTL_SECONDS: float = 15.0
+    SCHEDULER_LEASE_POLL_SECONDS: float = 1.0  # how often a standby replica retries the lease
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_READ_LIMIT: int = 64  # initial concurrent GET/HEAD requests; adapts between min and max
+    ADMISSION_READ_MAX_LIMIT: int = 256
+    ADMISSION_READ_LATENCY_TARGET_SECONDS: float = 0.25
+    ADMISSION_WRITE_LIMIT: int = 32  # initial concurrent POST/PUT/PATCH/DELETE requests
+    ADMISSION_WRITE_MAX_LIMIT: int = 128
+    ADMISSION_WRITE_LATENCY_TARGET_SECONDS: float = 0.5
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_QUEUE_SIZE: int = 256  # waiting requests per class before answering 429
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0  # longest wait for a slot before answering 503
+    ADMISSION_EXEMPT_PATHS: list[str] = ["/docs", "/redoc", "/openapi.json", "/admin", "/events"]
+    EVENTS_BUFFER_SIZE: int = 10_000  # events kept for resuming with Last-Event-ID
+    EVENTS_SUBSCRIBER_QUEUE_SIZE: int = 1000  # undelivered events before a subscriber is dropped
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_MAX_STREAM_SECONDS: float = 300.0  # streams are closed after this; clients resume with Last-Event-ID
+    # function_name -> "module:attribute", imported on first run; plugins can also use "scheduler.jobs" entry points
+    JOB_FUNCTIONS: dict[str, str] = {
+        "dummy_number_crunch": "app.jobs.builtin:dummy_number_crunch",
+        "print_hello": "app.jobs.builtin:print_hello",
+    }
+    JOB_WORKER_ALLOWLIST: Optional[list[str]] = None  # function_names this worker runs; None runs all
+    JOB_PROFILE_FUNCTIONS: list[str] = []  # function_names run under cProfile from startup
+    PROFILE_MAX_SECONDS: float = 60.0  # longest sampling capture /admin/profile/sample accepts
+    JOB_METADATA_INDEXED_KEYS: list[str] = ["tenant", "tag"]  # keys filterable via ?meta.<key>= with an index
 
 
 settings = Settings()
@@ -1,16 +1,41 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    pool_size=100,
-    max_overflow=200,
-    pool_timeout=30,
-    pool_pre_ping=True,
-)
+
+def configure_sqlite(db_engine):
+    """Apply the SQLite concurrency pragmas to every new connection of ``db_engine``."""
+
+    @event.listens_for(db_engine, "connect")
+    def _set_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        try:
+            # WAL lets readers proceed while the single writer holds the lock
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(url: str):
+    is_sqlite = url.startswith("sqlite")
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        pool_size=100,
+        max_overflow=200,
+        pool_timeout=30,
+        pool_pre_ping=True,
+    )
+    if is_sqlite:
+        configure_sqlite(db_engine)
+    return db_engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -0,0 +1,134 @@
+import threading
+import uuid
+from collections import defaultdict, deque
+
+from sqlalchemy import select
+
+from app.models.job import Job, job_dependencies
+
+
+def load_dependency_edges(db_session) -> dict:
+    """Map each job id (str) to the set of job ids it depends on."""
+    upstreams = defaultdict(set)
+    for job_id, depends_on_id in db_session.execute(select(job_dependencies)).all():
+        upstreams[str(job_id)].add(str(depends_on_id))
+    return dict(upstreams)
+
+
+def find_cycle(upstreams: dict, job_id: str, new_upstreams) -> list:
+    """
+    Return the dependency path that would close a cycle if ``job_id`` came to
+    depend on ``new_upstreams``, or an empty list if the graph stays acyclic.
+    """
+    for start in new_upstreams:
+        if start == job_id:
+            return [job_id, job_id]
+        # Walk upstream from each new dependency; reaching job_id means it already depends on us
+        parents = {start: None}
+        pending = deque([start])
+        while pending:
+            current = pending.popleft()
+            for upstream in upstreams.get(current, ()):
+                if upstream in parents:
+                    continue
+                parents[upstream] = current
+                if upstream == job_id:
+                    path = [job_id]
+                    node = current
+                    while node is not None:
+                        path.append(node)
+                        node = parents[node]
+                    return [job_id] + path[::-1]
+                pending.append(upstream)
+    return []
+
+
+def _downstreams(upstreams: dict) -> dict:
+    downstreams = defaultdict(set)
+    for job_id, parents in upstreams.items():
+        for parent in parents:
+            downstreams[parent].add(job_id)
+    return downstreams
+
+
+def _reachable(edges: dict, start: str) -> set:
+    seen = {start}
+    pending = deque([start])
+    while pending:
+        for nxt in edges.get(pending.popleft(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                pending.append(nxt)
+    return seen
+
+
+def dependency_graph(db_session, job_id: str) -> dict:
+    """Every ancestor and descendant of ``job_id`` with the edges between them."""
+    upstreams = load_dependency_edges(db_session)
+    members = _reachable(upstreams, job_id) | _reachable(_downstreams(upstreams), job_id)
+
+    rows = db_session.execute(
+        select(Job.id, Job.name, Job.function_name, Job.status)
+        .where(Job.id.in_([uuid.UUID(member) for member in members]))
+    ).all()
+    nodes = sorted(
+        (
+            {"id": str(row.id), "name": row.name, "function_name": row.function_name, "status": row.status.value}
+            for row in rows
+        ),
+        key=lambda node: node["id"],
+    )
+    edges = [
+        {"upstream": parent, "downstream": child}
+        for child in sorted(members)
+        for parent in sorted(upstreams.get(child, ()))
+        if parent in members
+    ]
+    return {"job_id": job_id, "nodes": nodes, "edges": edges}
+
+
+class DependencyTracker:
+    """
+    In-memory trigger progress of dependent jobs.
+
+    The edges themselves are read from ``job_dependencies`` on every upstream
+    success, so every worker sees the same graph. Only the set of upstreams
+    that have succeeded since each downstream's last trigger lives here. It is
+    empty after a restart or takeover, so a pipeline interrupted mid-way resumes
+    on the upstream's next success.
+    """
+
+    def __init__(self):
+        self._satisfied = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def reset(self, job_id: str = None):
+        """Forget the progress of ``job_id`` (e.g. after its dependencies changed), or of every job."""
+        with self._lock:
+            if job_id is None:
+                self._satisfied.clear()
+            else:
+                self._satisfied.pop(job_id, None)
+
+    def remove(self, job_id: str):
+        with self._lock:
+            self._satisfied.pop(job_id, None)
+            for satisfied in self._satisfied.values():
+                satisfied.discard(job_id)
+
+    def record_success(self, job_id: str, upstreams: dict) -> list:
+        """
+        Note that ``job_id`` succeeded; ``upstreams`` maps each of its downstream
+        jobs to that job's current upstream ids. Return the downstream jobs now ready.
+        """
+        ready = []
+        with self._lock:
+            for child, parents in upstreams.items():
+                satisfied = self._satisfied[child]
+                satisfied.add(job_id)
+                # Dependencies may have changed through another worker since the last success
+                satisfied &= parents
+                if satisfied >= parents:
+                    satisfied.clear()
+                    ready.append(child)
+        return ready
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+JOB_CREATED = "job.created"
+JOB_UPDATED = "job.updated"
+JOB_DELETED = "job.deleted"
+JOBS_DELETED = "jobs.deleted"
+JOB_EXECUTED = "job.executed"
+JOB_FAILED = "job.failed"
+EVENT_TYPES = (JOB_CREATED, JOB_UPDATED, JOB_DELETED, JOBS_DELETED, JOB_EXECUTED, JOB_FAILED)
+
+
+class CursorExpiredError(Exception):
+    """Raised when a resume cursor points before the oldest retained event."""
+
+
+class SubscriberDroppedError(Exception):
+    """Raised to a subscriber that fell too far behind and was disconnected."""
+
+
+class Subscription:
+    """
+    One client's view of the bus: a bounded queue of matching events.
+
+    Publishers run on arbitrary threads, the reader awaits on its own event
+    loop, so the queue is guarded by a thread lock and the reader is woken
+    with ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, max_pending: int, types=None, job_id: str = None):
+        self.max_pending = max_pending
+        self.types = frozenset(types) if types else None
+        self.job_id = job_id
+        self.dropped = False
+        self.closed = False
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+    def matches(self, event: dict) -> bool:
+        if self.types is not None and event["type"] not in self.types:
+            return False
+        return self.job_id is None or event["job_id"] == self.job_id
+
+    def _push(self, event: dict) -> bool:
+        """Queue ``event``; returns ``False`` once the subscriber has overflowed."""
+        with self._lock:
+            if self.dropped or self.closed:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.dropped = True
+                self._pending.clear()
+            else:
+                self._pending.append(event)
+        self._notify()
+        return not self.dropped
+
+    def _close(self):
+        with self._lock:
+            self.closed = True
+        self._notify()
+
+    def _notify(self):
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Loop already closed; the reader is gone
+            pass
+
+    async def next(self, timeout: float = None):
+        """
+        Return the next event, or ``None`` on timeout or once the subscription is
+        closed. Raises ``SubscriberDroppedError`` if the subscriber overflowed.
+        """
+        while True:
+            with self._lock:
+                if self.dropped:
+                    raise SubscriberDroppedError()
+                if self._pending:
+                    return self._pending.popleft()
+                if self.closed:
+                    return None
+                self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+
+class EventBus:
+    """
+    In-process pub/sub for job lifecycle and execution events.
+
+    Every event gets a monotonically increasing ``offset`` and is kept in a
+    ring buffer of ``buffer_size`` entries, so a reconnecting client can resume
+    after the last offset it saw as long as that offset is still buffered.
+    """
+
+    def __init__(self, buffer_size: int = 10_000, subscriber_queue_size: int = 1000):
+        self.subscriber_queue_size = subscriber_queue_size
+        self._buffer = deque(maxlen=buffer_size)
+        self._next_offset = 1
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.dropped_subscribers = 0
+
+    @property
+    def last_offset(self) -> int:
+        return self._next_offset - 1
+
+    def publish(self, event_type: str, job_id: str = None, data: dict = None) -> dict:
+        with self._lock:
+            event = {
+                "offset": self._next_offset,
+                "type": event_type,
+                "job_id": job_id,
+                "at": datetime.now(timezone.utc).isoformat(),
+                "data": data,
+            }
+            self._next_offset += 1
+            self._buffer.append(event)
+            subscribers = [s for s in self._subscribers if s.matches(event)]
+        for subscription in subscribers:
+            if not subscription._push(event):
+                self._discard(subscription, dropped=True)
+        return event
+
+    def subscribe(self, types=None, job_id: str = None, after: int = None) -> Subscription:
+        """
+        Register a subscriber; with ``after`` it first receives the buffered
+        events with a greater offset. Must be called from the reader's event loop.
+        """
+        subscription = Subscription(self.subscriber_queue_size, types=types, job_id=job_id)
+        with self._lock:
+            if after is not None:
+                oldest = self._buffer[0]["offset"] if self._buffer else self._next_offset
+                if after < oldest - 1:
+                    raise CursorExpiredError(
+                        f"Offset {after} is no longer buffered; oldest available is {oldest}"
+                    )
+                for event in self._buffer:
+                    if event["offset"] > after and subscription.matches(event):
+                        subscription._pending.append(event)
+                if len(subscription._pending) > subscription.max_pending:
+                    raise CursorExpiredError(
+                        f"Offset {after} is more than {subscription.max_pending} matching events behind"
+                    )
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._discard(subscription)
+
+    def close(self):
+        """End every open subscription, e.g. on shutdown."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscription in subscribers:
+            subscription._close()
+
+    def _discard(self, subscription: Subscription, dropped: bool = False):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.discard(subscription)
+                if dropped:
+                    self.dropped_subscribers += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "last_offset": self.last_offset,
+                "buffered": len(self._buffer),
+                "subscribers": len(self._subscribers),
+                "dropped_subscribers": self.dropped_subscribers,
+            }
+
+
+event_bus = EventBus(
+    buffer_size=settings.EVENTS_BUFFER_SIZE,
+    subscriber_queue_size=settings.EVENTS_SUBSCRIBER_QUEUE_SIZE,
+)
@@ -0,0 +1,85 @@
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.logger import safe_log
+from app.core.sqlite_writer import writer_for
+from app.models.lease import scheduler_leases
+
+
+def default_owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SchedulerLease:
+    """
+    Time-limited ownership of the scheduler stored in ``scheduler_leases``.
+
+    Only the holder fires scheduled jobs. The holder renews well before
+    ``ttl_seconds`` runs out; releasing on shutdown lets a standby replica take
+    over on its next poll instead of waiting for expiry.
+    """
+
+    def __init__(self, db_engine, name: str = "scheduler", ttl_seconds: float = 15.0, owner_id: str = None):
+        self.db_engine = db_engine
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner_id = owner_id or default_owner_id()
+        self.held = False
+
+    def try_acquire(self) -> bool:
+        """Take or renew the lease if it is free, expired or already ours."""
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        table = scheduler_leases
+
+        def take(conn):
+            result = conn.execute(
+                update(table)
+                .where(
+                    table.c.name == self.name,
+                    or_(
+                        table.c.owner == self.owner_id,
+                        table.c.owner.is_(None),
+                        table.c.expires_at < now,
+                    ),
+                )
+                .values(owner=self.owner_id, expires_at=expires_at)
+            )
+            if result.rowcount == 0:
+                conn.execute(
+                    insert(table).values(name=self.name, owner=self.owner_id, expires_at=expires_at)
+                )
+
+        try:
+            writer_for(self.db_engine).execute(take)
+            self.held = True
+        except IntegrityError:
+            # Row exists and belongs to a live owner
+            self.held = False
+        except Exception as e:
+            safe_log(f"Lease '{self.name}' check failed: {e}", level=logging.ERROR)
+            self.held = False
+        return self.held
+
+    def release(self):
+        if not self.held:
+            return
+        table = scheduler_leases
+        stmt = (
+            update(table)
+            .where(table.c.name == self.name, table.c.owner == self.owner_id)
+            .values(owner=None, expires_at=None)
+        )
+        try:
+            writer_for(self.db_engine).execute(lambda conn: conn.execute(stmt))
+            safe_log(f"Lease '{self.name}' released by {self.owner_id}")
+        except Exception as e:
+            safe_log(f"Failed to release lease '{self.name}': {e}", level=logging.ERROR)
+        finally:
+            self.held = False
@@ -2,6 +2,8 @@ import logging
 import threading
 from logging.handlers import RotatingFileHandler
 
+from app.core.config import settings
+
 # Create logger
 logger = logging.getLogger("scheduler")
 logger.setLevel(logging.INFO)
@@ -10,7 +12,7 @@ logger.setLevel(logging.INFO)
 if not logger.handlers:
     # Rotating file handler: 5 MB max, 3 backups
     file_handler = RotatingFileHandler(
-        "scheduler.log", maxBytes=5 * 1024 * 1024, backupCount=3
+        settings.LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3
     )
     formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
     file_handler.setFormatter(formatter)
@@ -0,0 +1,93 @@
+import json
+import logging
+import re
+
+from sqlalchemy import func, literal_column, text, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.logger import safe_log
+from app.models.job import Job
+
+META_PARAM_PREFIX = "meta."
+GENERATED_COLUMN_PREFIX = "meta_"
+
+_KEY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def is_valid_metadata_key(key: str) -> bool:
+    return bool(_KEY_PATTERN.match(key))
+
+
+def generated_column_name(key: str) -> str:
+    return f"{GENERATED_COLUMN_PREFIX}{key}"
+
+
+def parse_metadata_value(raw: str):
+    """Interpret ``?meta.key=value`` values as JSON scalars, falling back to the raw string."""
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return raw
+    if isinstance(value, (dict, list)) or value is None:
+        return raw
+    return value
+
+
+def metadata_filters_from_query(query_params) -> dict:
+    """
+    Collect ``meta.<key>=<value>`` query parameters.
+
+    Raises ``ValueError`` for keys that are not plain identifiers.
+    """
+    filters = {}
+    for name, raw in query_params.multi_items():
+        if not name.startswith(META_PARAM_PREFIX):
+            continue
+        key = name[len(META_PARAM_PREFIX):]
+        if not is_valid_metadata_key(key):
+            raise ValueError(f"Invalid metadata key '{key}'")
+        filters[key] = parse_metadata_value(raw)
+    return filters
+
+
+def metadata_filter_clauses(dialect_name: str, filters: dict, indexed_keys=()) -> list:
+    """Build WHERE clauses for ``filters`` that the backend's metadata indexes can serve."""
+    if not filters:
+        return []
+    if dialect_name == "postgresql":
+        # A single containment test is answered by the GIN index
+        return [type_coerce(Job.job_metadata, JSONB).contains(filters)]
+
+    clauses = []
+    for key, value in filters.items():
+        if dialect_name == "sqlite" and key in indexed_keys:
+            clauses.append(literal_column(generated_column_name(key)) == value)
+        else:
+            clauses.append(func.json_extract(Job.job_metadata, f"$.{key}") == value)
+    return clauses
+
+
+def ensure_metadata_indexes(engine, keys):
+    """
+    On SQLite, add one virtual generated column with its own index per
+    configured key. They follow ``JOB_METADATA_INDEXED_KEYS``, so they are kept
+    up at startup rather than by Alembic. PostgreSQL's JSONB column and GIN
+    index are part of the migrations.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        existing = {row[1] for row in conn.execute(text("PRAGMA table_xinfo(jobs)"))}
+        for key in keys:
+            if not is_valid_metadata_key(key):
+                safe_log(f"Skipping invalid indexed metadata key '{key}'", level=logging.WARNING)
+                continue
+            column = generated_column_name(key)
+            if column not in existing:
+                conn.execute(
+                    text(
+                        f"ALTER TABLE jobs ADD COLUMN {column} "
+                        f"GENERATED ALWAYS AS (json_extract(job_metadata, '$.{key}')) VIRTUAL"
+                    )
+                )
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_jobs_{column} ON jobs ({column})"))
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic import command, op
+from alembic.config import Config
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def alembic_config() -> Config:
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    return config
+
+
+def include_object(dialect_name: str):
+    """
+    Autogenerate filter for ``dialect_name``. It skips indexes declared for
+    another dialect with ``ddl_if``. It also skips what the app adds outside
+    Alembic: SQLite metadata generated columns and APScheduler's job tables.
+    """
+    # Imported here: env.py loads this module before the models are needed
+    from app.core.metadata_query import GENERATED_COLUMN_PREFIX
+
+    def include(obj, name, type_, reflected, compare_to):
+        ddl_if = getattr(obj, "_ddl_if", None)
+        if ddl_if is not None and ddl_if.dialect and ddl_if.dialect != dialect_name:
+            return False
+        if reflected and compare_to is None:
+            if type_ == "table" and name.startswith("apscheduler_jobs"):
+                return False
+            if type_ == "column" and name.startswith(GENERATED_COLUMN_PREFIX):
+                return False
+            if type_ == "index" and name.startswith(f"ix_jobs_{GENERATED_COLUMN_PREFIX}"):
+                return False
+        return True
+
+    return include
+
+
+def run_migrations(db_engine, revision: str = "head"):
+    """Upgrade the database behind ``db_engine`` to ``revision``."""
+    config = alembic_config()
+    with db_engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def drop_generated_columns(table: str = "jobs"):
+    """
+    For use inside a migration: batch mode cannot copy SQLite generated columns
+    into the rebuilt table, so drop them and their indexes first. They are not
+    restored by Alembic; ``ensure_metadata_indexes`` re-creates them at app startup.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    # table_xinfo marks virtual generated columns with hidden=2 and stored ones with hidden=3
+    generated = [row[1] for row in bind.execute(sa.text(f"PRAGMA table_xinfo({table})")) if row[6] in (2, 3)]
+    for column in generated:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
@@ -0,0 +1,241 @@
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.core.config import settings
+from app.core.logger import safe_log
+
+_current_job = ContextVar("current_job", default=None)
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a sampling capture is requested while another one is running."""
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over every thread in the process.
+
+    Each sample walks ``sys._current_frames()`` and counts the stack, so
+    capturing costs a few microseconds per thread per interval. Nothing needs to be
+    instrumented, and it sees API request threads and job workers alike.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def capture(self, seconds: float, interval: float = 0.005) -> Counter:
+        """Sample for ``seconds`` and return collapsed stacks with their sample counts."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A sampling capture is already running")
+        try:
+            own_ident = threading.get_ident()
+            stacks = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+                time.sleep(interval)
+            return stacks
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{code.co_firstlineno}")
+            frame = frame.f_back
+        parts.append(thread_name.replace(";", "_"))
+        return ";".join(reversed(parts))
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Render stacks in the ``frame;frame;frame count`` format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class _StageStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+        }
+
+
+class JobProfiler:
+    """
+    Per-``function_name`` profiling of registered jobs.
+
+    Every execution records its total time and any ``stage()`` timings it
+    reports. Functions switched on with ``enable()`` (or listed in
+    ``JOB_PROFILE_FUNCTIONS``) also run under ``cProfile``, and the results
+    are merged into a single ``pstats.Stats`` per function. Since Python 3.12
+    only one ``cProfile.Profile`` may be active per process, so a run that
+    overlaps another profiled run goes unprofiled (counted as
+    ``cprofile_skipped``), keeping its stage timings. Profiler errors never
+    fail the job.
+    """
+
+    def __init__(self, enabled=()):
+        self._enabled = set(enabled)
+        self._stats = {}
+        self._stages = {}
+        self._skipped = Counter()
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+
+    def is_enabled(self, name: str) -> bool:
+        return name in self._enabled
+
+    def enable(self, name: str):
+        self._enabled.add(name)
+
+    def disable(self, name: str):
+        self._enabled.discard(name)
+
+    def reset(self, name: str = None):
+        with self._lock:
+            if name is None:
+                self._stats.clear()
+                self._stages.clear()
+                self._skipped.clear()
+            else:
+                self._stats.pop(name, None)
+                self._stages.pop(name, None)
+                self._skipped.pop(name, None)
+
+    def run(self, name: str, func, *args, **kwargs):
+        token = _current_job.set(name)
+        started = time.perf_counter()
+        try:
+            if name not in self._enabled:
+                return func(*args, **kwargs)
+            if not self._cprofile_lock.acquire(blocking=False):
+                with self._lock:
+                    self._skipped[name] += 1
+                return func(*args, **kwargs)
+            try:
+                profile = self._start_profile(name)
+                if profile is None:
+                    return func(*args, **kwargs)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._finish_profile(name, profile)
+            finally:
+                self._cprofile_lock.release()
+        finally:
+            self.record_stage(name, "total", time.perf_counter() - started)
+            _current_job.reset(token)
+
+    def _start_profile(self, name: str):
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        except Exception as e:
+            # e.g. a debugger or coverage tool already holds the profiling hook
+            safe_log(f"cProfile unavailable for {name}, running unprofiled: {e}", level=logging.WARNING)
+            with self._lock:
+                self._skipped[name] += 1
+            return None
+
+    def _finish_profile(self, name: str, profile: cProfile.Profile):
+        try:
+            profile.disable()
+            self._merge(name, profile)
+        except Exception as e:
+            safe_log(f"Failed to record cProfile stats for {name}: {e}", level=logging.WARNING)
+
+    def _merge(self, name: str, profile: cProfile.Profile):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+
+    def record_stage(self, name: str, stage_name: str, elapsed: float):
+        with self._lock:
+            stages = self._stages.setdefault(name, {})
+            stats = stages.get(stage_name)
+            if stats is None:
+                stats = stages[stage_name] = _StageStats()
+            stats.add(elapsed)
+
+    def pstats_bytes(self, name: str):
+        """The merged profile in the file format written by ``pstats.Stats.dump_stats``."""
+        with self._lock:
+            stats = self._stats.get(name)
+            return None if stats is None else marshal.dumps(stats.stats)
+
+    def pstats_text(self, name: str, limit: int = 30):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                return None
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats("cumulative").print_stats(limit)
+            stats.stream = sys.stdout
+            return out.getvalue()
+
+    def summary(self) -> dict:
+        with self._lock:
+            names = set(self._stages) | set(self._stats) | self._enabled
+            return {
+                name: {
+                    "cprofile": name in self._enabled,
+                    "has_pstats": name in self._stats,
+                    "cprofile_skipped": self._skipped[name],
+                    "stages": {
+                        stage_name: stats.to_dict()
+                        for stage_name, stats in self._stages.get(name, {}).items()
+                    },
+                }
+                for name in sorted(names)
+            }
+
+
+@contextmanager
+def stage(stage_name: str):
+    """Time a step of the running job (e.g. ``db_fetch``, ``commit``) under its ``function_name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        name = _current_job.get()
+        if name is not None:
+            job_profiler.record_stage(name, stage_name, time.perf_counter() - started)
+
+
+sampling_profiler = SamplingProfiler()
+job_profiler = JobProfiler(enabled=settings.JOB_PROFILE_FUNCTIONS)
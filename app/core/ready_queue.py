@@ -0,0 +1,219 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.logger import safe_log
+
+
+class QueueFullError(Exception):
+    """Raised when the ready queue is at capacity."""
+
+
+class _Entry:
+    __slots__ = ("key", "func", "kwargs", "cancelled")
+
+    def __init__(self, key, func, kwargs):
+        self.key = key
+        self.func = func
+        self.kwargs = kwargs
+        self.cancelled = False
+
+
+class ReadyQueue:
+    """
+    Bounded in-memory queue of one-off executions.
+
+    Immediate work goes on a FIFO deque, delayed work on a heap ordered by run
+    time; a dispatcher thread hands due entries to a thread pool without ever
+    letting more than ``max_workers`` sit in the pool. Nothing touches the
+    database, so enqueueing costs a lock and an append.
+
+    Cancelled and replaced entries stay behind as tombstones until the
+    dispatcher reaches them, but only live entries count toward ``max_size``.
+    Once tombstones make up more than half the queue it is compacted.
+    """
+
+    # Below this many queued entries tombstones are left for the dispatcher to skip
+    COMPACT_MIN_SIZE = 64
+
+    def __init__(self, max_size: int = 100_000, max_workers: int = 10, on_complete=None):
+        self.max_size = max_size
+        self.max_workers = max_workers
+        self.on_complete = on_complete
+
+        self._ready = deque()
+        self._delayed = []
+        self._keyed = {}
+        self._live = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(max_workers)
+        self._stopping = False
+        self._running = 0
+        self._thread = None
+        self._executor = None
+
+    def __len__(self):
+        return self._live
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def in_flight(self) -> int:
+        return self._running
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="ready-queue-worker"
+        )
+        self._thread = threading.Thread(target=self._dispatch_loop, name="ready-queue", daemon=True)
+        self._thread.start()
+
+    def stop_dispatching(self):
+        """Stop handing out entries; whatever is still queued stays queued."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Wait until no execution is running; ``False`` if ``timeout`` ran out first."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._running == 0, timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        self.stop_dispatching()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def submit(self, func, kwargs: dict = None, run_at: float = None, key=None):
+        """
+        Queue ``func(**kwargs)`` to run at ``run_at`` (epoch seconds) or as soon
+        as a worker is free. Submitting with the ``key`` of a pending entry
+        replaces it.
+        """
+        entry = _Entry(key, func, kwargs or {})
+        with self._cond:
+            if len(self) >= self.max_size:
+                raise QueueFullError(f"Ready queue is full ({self.max_size} entries)")
+            if key is not None:
+                previous = self._keyed.get(key)
+                if previous is not None:
+                    self._discard(previous)
+                self._keyed[key] = entry
+            if run_at is None or run_at <= time.time():
+                self._ready.append(entry)
+            else:
+                heapq.heappush(self._delayed, (run_at, next(self._seq), entry))
+            self._live += 1
+            self._maybe_compact()
+            self._cond.notify()
+
+    def cancel(self, key) -> bool:
+        with self._cond:
+            entry = self._keyed.pop(key, None)
+            if entry is None:
+                return False
+            # Lazy deletion: the dispatcher skips cancelled entries when it reaches them
+            self._discard(entry)
+            self._maybe_compact()
+            return True
+
+    def cancel_all(self):
+        """Cancel every keyed entry; anonymous entries still run."""
+        with self._cond:
+            for entry in self._keyed.values():
+                self._discard(entry)
+            self._keyed.clear()
+            self._maybe_compact()
+
+    def _discard(self, entry: _Entry):
+        if not entry.cancelled:
+            entry.cancelled = True
+            self._live -= 1
+
+    def _maybe_compact(self):
+        queued = len(self._ready) + len(self._delayed)
+        if queued < self.COMPACT_MIN_SIZE or queued - self._live <= queued // 2:
+            return
+        self._ready = deque(entry for entry in self._ready if not entry.cancelled)
+        self._delayed = [item for item in self._delayed if not item[2].cancelled]
+        heapq.heapify(self._delayed)
+
+    def _next_due(self):
+        """Pop the next runnable entry, or return how long to wait for one."""
+        while self._ready:
+            entry = self._ready.popleft()
+            if not entry.cancelled:
+                self._live -= 1
+                return entry, None
+        while self._delayed:
+            run_at, _, entry = self._delayed[0]
+            if entry.cancelled:
+                heapq.heappop(self._delayed)
+                continue
+            delay = run_at - time.time()
+            if delay > 0:
+                return None, delay
+            heapq.heappop(self._delayed)
+            self._live -= 1
+            return entry, None
+        return None, None
+
+    def _dispatch_loop(self):
+        while True:
+            # Poll for a free slot so a stop request is noticed while every worker is busy
+            while not self._slots.acquire(timeout=0.05):
+                if self._stopping:
+                    return
+            with self._cond:
+                entry, delay = None, None
+                while not self._stopping:
+                    entry, delay = self._next_due()
+                    if entry is not None:
+                        break
+                    self._cond.wait(timeout=delay)
+                if self._stopping:
+                    if entry is not None:
+                        self._requeue(entry)
+                    self._slots.release()
+                    return
+                if entry.key is not None and self._keyed.get(entry.key) is entry:
+                    del self._keyed[entry.key]
+                self._running += 1
+
+            self._executor.submit(self._run, entry)
+
+    def _requeue(self, entry: _Entry):
+        self._ready.appendleft(entry)
+        self._live += 1
+
+    def _run(self, entry: _Entry):
+        error = None
+        try:
+            entry.func(**entry.kwargs)
+        except Exception as e:
+            error = e
+            safe_log(f"Queued execution {entry.key} failed: {e}", level=logging.ERROR)
+        finally:
+            self._slots.release()
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+        if self.on_complete is not None:
+            try:
+                self.on_complete(entry.key, entry.kwargs, error)
+            except Exception as e:
+                safe_log(f"Ready queue completion hook failed: {e}", level=logging.ERROR)
@@ -1,29 +1,263 @@
 import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
 
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_STOPPED
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
 
+from app.core.cache import job_cache
 from app.core.config import settings
 from app.core.database import engine
+from app.core.dependencies import DependencyTracker
+from app.core.events import JOB_EXECUTED, JOB_FAILED, event_bus
+from app.core.lease import SchedulerLease
 from app.core.logger import safe_log
-from app.jobs.registry import JOB_REGISTRY
-from app.models.job import Job, JobStatus
+from app.core.ready_queue import ReadyQueue
+from app.core.sqlite_writer import writer_for
+from app.core.timing_wheel import TimingWheelScheduler
+from app.jobs.registry import JOB_REGISTRY, get_job_function, is_allowed, run_registered_job
+from app.models.job import Job, JobStatus, job_dependencies
+
+
+# Ready-queue key suffix for runs triggered by upstream jobs, so they coalesce per job
+DEPENDENCY_RUN_SUFFIX = ":dependency"
+
+
+def jobstore_table(lease_name: str) -> str:
+    """APScheduler's job table for a worker group; the default group keeps ``apscheduler_jobs``."""
+    return "apscheduler_jobs" if lease_name == "scheduler" else f"apscheduler_jobs_{lease_name}"
+
+
+class StoppableBackgroundScheduler(BackgroundScheduler):
+    """
+    ``BackgroundScheduler`` that stays idle once stopped.
+
+    ``shutdown()`` wakes the main loop, which then runs one more pass over the
+    job stores after the executors have shut down. Even on a paused scheduler,
+    that pass advances (or removes) every due job in the shared store, so the
+    runs are lost for the replica that holds the lease.
+    """
+
+    def _process_jobs(self):
+        if self.state == STATE_STOPPED:
+            return None
+        return super()._process_jobs()
 
 
 class SchedulerManager:
     def __init__(self, db_engine):
-        jobstores = {"default": SQLAlchemyJobStore(engine=db_engine)}
-        self.scheduler = BackgroundScheduler(
-            jobstores=jobstores, job_defaults=settings.SCHEDULER_JOB_DEFAULTS
+        self.db_engine = db_engine
+        self.scheduler = self._create_scheduler(settings.SCHEDULER_ENGINE)
+        self.scheduler.add_listener(self._on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        self.ready_queue = ReadyQueue(
+            max_size=settings.READY_QUEUE_MAX_SIZE,
+            max_workers=settings.READY_QUEUE_MAX_WORKERS,
+            on_complete=self._on_queued_run_complete,
+        )
+        self.dependencies = DependencyTracker()
+        self.lease = None
+        if settings.SCHEDULER_LEASE_ENABLED:
+            self.lease = SchedulerLease(
+                db_engine,
+                name=settings.SCHEDULER_LEASE_NAME,
+                ttl_seconds=settings.SCHEDULER_LEASE_TTL_SECONDS,
+            )
+        self._heartbeat = None
+        self._heartbeat_stop = threading.Event()
+        # Schedule fingerprint of every in-memory-only job this process holds, by id
+        self._in_memory = {}
+        self._sync_lock = threading.RLock()
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica holds the lease (always true with the lease disabled)."""
+        return self.lease is None or self.lease.held
+
+    def _in_memory_only(self, job: Job) -> bool:
+        # One-shot jobs and timing-wheel schedules live in this process, not in a shared job store
+        return job.is_one_shot or isinstance(self.scheduler, TimingWheelScheduler)
+
+    @staticmethod
+    def _fingerprint(job: Job) -> tuple:
+        return (job.function_name, job.interval_seconds, job.cron_expression, job.run_at, job.job_metadata)
+
+    def start(self):
+        """
+        Start the scheduler and the ready queue. Without the lease the scheduler
+        starts paused and a heartbeat thread keeps trying to take over. The
+        ready queue runs on every replica for "run now" requests, but only the
+        lease holder loads one-shot jobs (and, with the timing wheel, every schedule).
+        """
+        if self.scheduler.running:
+            return
+        active = self.lease is None or self.lease.try_acquire()
+        self.scheduler.start(paused=not active)
+        self.ready_queue.start()
+        if self.lease is not None:
+            self._heartbeat_stop.clear()
+            self._heartbeat = threading.Thread(
+                target=self._heartbeat_loop, name="scheduler-lease", daemon=True
+            )
+            self._heartbeat.start()
+        safe_log(
+            f"Scheduler started (engine={settings.SCHEDULER_ENGINE}, "
+            f"{'active' if active else 'standby'})"
         )
-        self.scheduler.start()
-        safe_log("Scheduler started")
         safe_log(f"Loaded functions {JOB_REGISTRY}")
 
+    def _heartbeat_loop(self):
+        while True:
+            if self.lease.held:
+                interval = self.lease.ttl_seconds / 3
+            else:
+                interval = settings.SCHEDULER_LEASE_POLL_SECONDS
+            if self._heartbeat_stop.wait(interval):
+                return
+            was_held = self.lease.held
+            held = self.lease.try_acquire()
+            if held and not was_held:
+                safe_log(f"Scheduler lease acquired by {self.lease.owner_id}; resuming")
+                self.sync_in_memory_jobs()
+                self.scheduler.resume()
+            elif held:
+                self.sync_in_memory_jobs()
+                if not isinstance(self.scheduler, TimingWheelScheduler):
+                    # Other workers add jobs to the shared job store without waking this scheduler
+                    self.scheduler.wakeup()
+            elif was_held:
+                safe_log("Scheduler lease lost; pausing", level=logging.WARNING)
+                self.scheduler.pause()
+                self._drop_in_memory_jobs()
+
+    def sync_in_memory_jobs(self):
+        """
+        Bring the in-memory-only jobs in line with the DB. Other workers write
+        jobs without reaching this process, so the lease holder runs this on
+        takeover and on every renewal. Jobs that are new or whose schedule
+        changed are (re)loaded, and jobs that are no longer active are dropped.
+        """
+        query = select(Job).where(Job.status == JobStatus.ACTIVE)
+        if not isinstance(self.scheduler, TimingWheelScheduler):
+            query = query.where(Job.run_at.is_not(None))
+        try:
+            with self._sync_lock, Session(self.db_engine) as db_session:
+                jobs = db_session.scalars(query).all()
+                active = set()
+                for job in jobs:
+                    job_id = str(job.id)
+                    active.add(job_id)
+                    fingerprint = self._fingerprint(job)
+                    if self._in_memory.get(job_id) != fingerprint:
+                        self.remove_existing_job(job)
+                        self.add_job(job)
+                        # Recorded even when add_job skipped it, so each version is only tried once
+                        self._in_memory[job_id] = fingerprint
+                for job_id in set(self._in_memory) - active:
+                    self._remove_by_id(job_id)
+        except Exception as e:
+            safe_log(f"Failed to sync jobs from the DB: {e}", level=logging.ERROR)
+
+    def _drop_in_memory_jobs(self):
+        # The new holder reloads these from the DB; keeping them would run them twice
+        with self._sync_lock:
+            self.ready_queue.cancel_all()
+            if isinstance(self.scheduler, TimingWheelScheduler):
+                self.scheduler.remove_all_jobs()
+            self._in_memory.clear()
+
+    def shutdown(self, timeout: float = None) -> bool:
+        """
+        Stop firing, wait up to ``timeout`` seconds (``SHUTDOWN_GRACE_SECONDS`` by
+        default) for in-flight executions, flush bookkeeping and release the lease.
+        Returns ``False`` if executions were still running at the deadline.
+        """
+        if timeout is None:
+            timeout = settings.SHUTDOWN_GRACE_SECONDS
+        started = time.monotonic()
+
+        self._heartbeat_stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        if self.scheduler.running:
+            self.scheduler.pause()
+        # Queued entries stay queued; only what is already running gets to finish
+        self.ready_queue.stop_dispatching()
+
+        drain = threading.Thread(target=self._drain, name="scheduler-drain", daemon=True)
+        drain.start()
+        drain.join(timeout)
+        drained = not drain.is_alive()
+        if not drained:
+            safe_log(
+                f"In-flight executions still running after {timeout}s; not waiting any longer",
+                level=logging.WARNING,
+            )
+
+        if isinstance(self.scheduler, TimingWheelScheduler):
+            self.scheduler.flush()
+        if self.lease is not None:
+            self.lease.release()
+        writer_for(self.db_engine).close()
+        safe_log(f"Scheduler stopped in {time.monotonic() - started:.2f}s (drained={drained})")
+        return drained
+
+    def _drain(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=True)
+        self.ready_queue.shutdown(wait=True)
+
+    def _create_scheduler(self, engine_name: str):
+        if engine_name == "timing_wheel":
+            return TimingWheelScheduler(
+                job_defaults=settings.SCHEDULER_JOB_DEFAULTS,
+                tick_seconds=settings.TIMING_WHEEL_TICK_SECONDS,
+                slots=settings.TIMING_WHEEL_SLOTS,
+                levels=settings.TIMING_WHEEL_LEVELS,
+                max_workers=settings.SCHEDULER_MAX_WORKERS,
+                on_reschedule=self.persist_next_runs,
+            )
+        if engine_name == "apscheduler":
+            # Each worker group fires only the jobs it stored itself
+            jobstores = {
+                "default": SQLAlchemyJobStore(
+                    engine=self.db_engine, tablename=jobstore_table(settings.SCHEDULER_LEASE_NAME)
+                )
+            }
+            return StoppableBackgroundScheduler(
+                jobstores=jobstores,
+                executors={"default": {"type": "threadpool", "max_workers": settings.SCHEDULER_MAX_WORKERS}},
+                job_defaults=settings.SCHEDULER_JOB_DEFAULTS,
+            )
+        raise ValueError(f"Unknown SCHEDULER_ENGINE '{engine_name}'")
+
+    def persist_next_runs(self, updates):
+        """Write a batch of ``(job_id, next_run_at)`` pairs to the jobs table."""
+        table = Job.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(next_run_at=bindparam("b_next_run_at"))
+        )
+        params = [
+            {"b_id": uuid.UUID(job_id), "b_next_run_at": next_run_at}
+            for job_id, next_run_at in updates
+        ]
+        writer_for(self.db_engine).execute(lambda conn: conn.execute(stmt, params))
+        for job_id, _ in updates:
+            job_cache.invalidate(job_id)
+
     def add_job(self, job: Job):
         trigger = job.get_trigger()
         if not trigger:
-            safe_log(f"Job {job.id} has no valid schedule. Skipping.")
+            safe_log(f"Job {job.id} has no schedule of its own; it only runs when its dependencies succeed.")
             return
 
         if job.next_run_at is None:
@@ -38,12 +272,40 @@ class SchedulerManager:
             )
             return
 
+        if not is_allowed(job.function_name):
+            safe_log(f"Job {job.id} runs '{job.function_name}', which this worker does not run. Skipping.")
+            return
+
+        if not self._in_memory_only(job):
+            self._schedule(job, trigger)
+        elif not self.is_leader:
+            safe_log(f"Job {job.id} is left to the lease holder, which loads it on its next renewal.")
+        else:
+            with self._sync_lock:
+                if job.is_one_shot:
+                    self._enqueue_one_shot(job, func)
+                else:
+                    self._schedule(job, trigger)
+                self._in_memory[str(job.id)] = self._fingerprint(job)
+
+    def _schedule(self, job: Job, trigger):
+        options = {}
+        if isinstance(self.scheduler, TimingWheelScheduler):
+            # The wheel keeps nothing across restarts; resume from the persisted next run to keep the phase
+            next_run_at = job.next_run_at
+            options["next_run_time"] = next_run_at if next_run_at.tzinfo else next_run_at.replace(tzinfo=timezone.utc)
         try:
+            # The scheduler stores a reference to run_registered_job, never to the job module itself
             self.scheduler.add_job(
-                func,
+                run_registered_job,
                 trigger=trigger,
                 id=str(job.id),
-                kwargs={"job_id": str(job.id), "job_metadata": job.job_metadata},
+                kwargs={
+                    "function_name": job.function_name,
+                    "job_id": str(job.id),
+                    "job_metadata": job.job_metadata,
+                },
+                **options,
             )
             safe_log(
                 f"Scheduled job {job.id} "
@@ -53,8 +315,130 @@ class SchedulerManager:
         except Exception as e:
             safe_log(f"Failed to schedule job {job.id}: {e}", level=logging.ERROR)
 
+    def _enqueue_one_shot(self, job: Job, func):
+        run_at = job.next_run_at
+        if run_at.tzinfo is None:
+            run_at = run_at.replace(tzinfo=timezone.utc)
+        try:
+            self.ready_queue.submit(
+                func,
+                kwargs={"job_id": str(job.id), "job_metadata": job.job_metadata},
+                run_at=run_at.timestamp(),
+                key=str(job.id),
+            )
+            safe_log(f"Queued one-shot job {job.id} for {run_at.isoformat()}")
+        except Exception as e:
+            safe_log(f"Failed to queue one-shot job {job.id}: {e}", level=logging.ERROR)
+
+    def run_now(self, job_id: str, function_name: str, job_metadata: dict = None):
+        """
+        Queue an immediate, out-of-schedule execution. The job's own schedule is
+        untouched. Raises ``QueueFullError`` when the ready queue is at capacity
+        and ``JobNotAllowedError`` when this worker does not run ``function_name``.
+        """
+        func = get_job_function(function_name)
+        self.ready_queue.submit(func, kwargs={"job_id": job_id, "job_metadata": job_metadata})
+
+    def _on_job_event(self, event):
+        data = {"source": "schedule", "scheduled_run_time": event.scheduled_run_time.isoformat()}
+        if event.exception is not None:
+            data["error"] = str(event.exception)
+            event_bus.publish(JOB_FAILED, event.job_id, data)
+        else:
+            event_bus.publish(JOB_EXECUTED, event.job_id, data)
+            self._trigger_downstream(event.job_id)
+
+    def _on_queued_run_complete(self, key, kwargs, error):
+        # One-shot jobs are keyed by their id; "run now" and dependency runs leave the job as it was
+        if key is not None and not key.endswith(DEPENDENCY_RUN_SUFFIX):
+            self._record_one_shot_completion(key, error)
+        job_id = kwargs.get("job_id")
+        data = {"source": "queue"}
+        if error is not None:
+            data["error"] = str(error)
+            event_bus.publish(JOB_FAILED, job_id, data)
+        else:
+            event_bus.publish(JOB_EXECUTED, job_id, data)
+            self._trigger_downstream(job_id)
+
+    def reset_dependency_progress(self, job_id: str):
+        """Start counting upstream successes afresh after ``job_id``'s dependencies changed."""
+        self.dependencies.reset(job_id)
+
+    def forget_dependencies(self, job_id: str):
+        self.dependencies.remove(job_id)
+        self.ready_queue.cancel(job_id + DEPENDENCY_RUN_SUFFIX)
+
+    def _trigger_downstream(self, job_id: str):
+        """Queue every active downstream job whose dependencies have now all succeeded."""
+        if job_id is None:
+            return
+        try:
+            upstream_uuid = uuid.UUID(job_id)
+        except ValueError:
+            return
+        table = Job.__table__
+        edges = job_dependencies.c
+        try:
+            with self.db_engine.connect() as conn:
+                # Edges come from the DB so dependencies written through any worker count
+                children = select(edges.job_id).where(edges.depends_on_id == upstream_uuid)
+                upstreams = defaultdict(set)
+                for child, parent in conn.execute(
+                    select(edges.job_id, edges.depends_on_id).where(edges.job_id.in_(children))
+                ):
+                    upstreams[str(child)].add(str(parent))
+                ready = self.dependencies.record_success(job_id, upstreams)
+                if not ready:
+                    return
+                rows = conn.execute(
+                    select(table.c.id, table.c.function_name, table.c.job_metadata).where(
+                        table.c.id.in_([uuid.UUID(child) for child in ready]),
+                        table.c.status == JobStatus.ACTIVE,
+                    )
+                ).all()
+        except Exception as e:
+            safe_log(f"Failed to load downstream jobs of {job_id}: {e}", level=logging.ERROR)
+            return
+        # Independent branches go on the ready queue together and run in parallel across its workers
+        for row in rows:
+            child = str(row.id)
+            func = JOB_REGISTRY.get(row.function_name)
+            if func is None:
+                safe_log(f"Downstream job {child} has unknown function '{row.function_name}'", level=logging.ERROR)
+                continue
+            if not is_allowed(row.function_name):
+                continue
+            try:
+                self.ready_queue.submit(
+                    func,
+                    kwargs={"job_id": child, "job_metadata": row.job_metadata},
+                    key=child + DEPENDENCY_RUN_SUFFIX,
+                )
+                safe_log(f"Queued job {child} after its dependencies succeeded ({job_id} last)")
+            except Exception as e:
+                safe_log(f"Failed to queue downstream job {child}: {e}", level=logging.ERROR)
+
+    def _record_one_shot_completion(self, key, error):
+        table = Job.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == uuid.UUID(key), table.c.status == JobStatus.ACTIVE)
+            .values(
+                status=JobStatus.FAILED if error else JobStatus.COMPLETED,
+                last_run_at=datetime.now(timezone.utc),
+                next_run_at=None,
+            )
+        )
+        try:
+            writer_for(self.db_engine).execute(lambda conn: conn.execute(stmt))
+            job_cache.invalidate(key)
+        except Exception as e:
+            safe_log(f"Failed to record completion of one-shot job {key}: {e}", level=logging.ERROR)
+
     def load_existing_jobs(self, db_session):
         """Load and schedule existing active jobs from DB on startup."""
+        self.dependencies.reset()
         jobs = db_session.query(Job).filter(Job.status == JobStatus.ACTIVE).all()
         for job in jobs:
             try:
@@ -64,7 +448,13 @@ class SchedulerManager:
 
     def remove_existing_job(self, job: Job):
         """Remove a job from scheduler if it already exists."""
-        job_id_str = str(job.id)
+        self._remove_by_id(str(job.id))
+
+    def _remove_by_id(self, job_id_str: str):
+        with self._sync_lock:
+            self._in_memory.pop(job_id_str, None)
+        if self.ready_queue.cancel(job_id_str):
+            safe_log(f"One-shot job {job_id_str} removed from the ready queue.")
         existing_job = self.scheduler.get_job(job_id_str)
         if existing_job:
             safe_log(
@@ -75,6 +465,14 @@ class SchedulerManager:
             except Exception as e:
                 safe_log(f"Failed to remove existing job {job_id_str}: {e}", level=logging.ERROR)
 
+    def remove_all_jobs(self):
+        """Remove every scheduled and queued one-shot job."""
+        with self._sync_lock:
+            self.scheduler.remove_all_jobs()
+            self.ready_queue.cancel_all()
+            self._in_memory.clear()
+        self.dependencies.reset()
+
 
 # Singleton instance for global use
 scheduler_manager = SchedulerManager(engine)
@@ -0,0 +1,156 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.core.config import settings
+from app.core.logger import safe_log
+
+_STOP = object()
+
+
+class DirectWriter:
+    """Runs each write in its own transaction on the calling thread."""
+
+    def __init__(self, db_engine):
+        self.db_engine = db_engine
+
+    def execute(self, operation):
+        with self.db_engine.begin() as conn:
+            return operation(conn)
+
+    def close(self):
+        pass
+
+
+class SQLiteWriter:
+    """
+    Single writer thread for a SQLite database, with group commit.
+
+    ``execute(operation)`` hands ``operation(conn)`` to the writer and waits
+    for its result. The writer takes every operation queued within
+    ``max_delay`` seconds (up to ``max_batch``) and runs them in one
+    ``BEGIN IMMEDIATE`` transaction, each inside its own savepoint. One
+    operation failing rolls back only its own savepoint, and the whole batch
+    pays for a single commit. Readers are unaffected thanks to WAL.
+    """
+
+    def __init__(self, db_engine, max_batch: int = 256, max_delay: float = 0.002):
+        self.db_engine = db_engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.commits = 0
+        self.operations = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, operation) -> Future:
+        future = Future()
+        self.start()
+        self._queue.put((future, operation))
+        return future
+
+    def execute(self, operation):
+        return self.submit(operation).result()
+
+    def close(self):
+        """Commit everything already queued, then stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch):
+        outcomes = []
+        try:
+            # Driver-level autocommit so BEGIN/SAVEPOINT/COMMIT below are ours alone
+            with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                try:
+                    for future, operation in batch:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        conn.exec_driver_sql("SAVEPOINT op")
+                        try:
+                            result = operation(conn)
+                        except Exception as e:
+                            conn.exec_driver_sql("ROLLBACK TO SAVEPOINT op")
+                            conn.exec_driver_sql("RELEASE SAVEPOINT op")
+                            outcomes.append((future, None, e))
+                        else:
+                            conn.exec_driver_sql("RELEASE SAVEPOINT op")
+                            outcomes.append((future, result, None))
+                    conn.exec_driver_sql("COMMIT")
+                except BaseException:
+                    conn.exec_driver_sql("ROLLBACK")
+                    raise
+        except Exception as e:
+            safe_log(f"SQLite writer batch of {len(batch)} failed: {e}", level=logging.ERROR)
+            for future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.commits += 1
+        self.operations += len(outcomes)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def writer_for(db_engine):
+    """
+    Return the writer bookkeeping writes to ``db_engine`` should go through:
+    a shared ``SQLiteWriter`` for SQLite, otherwise a ``DirectWriter``.
+    """
+    if db_engine.dialect.name != "sqlite" or not settings.SQLITE_WRITER_ENABLED:
+        return DirectWriter(db_engine)
+    with _writers_lock:
+        writer = _writers.get(db_engine)
+        if writer is None:
+            writer = SQLiteWriter(
+                db_engine,
+                max_batch=settings.SQLITE_WRITER_MAX_BATCH,
+                max_delay=settings.SQLITE_WRITER_MAX_DELAY_SECONDS,
+            )
+            _writers[db_engine] = writer
+        return writer
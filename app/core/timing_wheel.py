@@ -0,0 +1,349 @@
+import logging
+import math
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from apscheduler.events import (
+    EVENT_ALL,
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_SUBMITTED,
+    JobExecutionEvent,
+    JobSubmissionEvent,
+)
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+
+from app.core.logger import safe_log
+
+WHEEL_JOBSTORE = "timing_wheel"
+
+
+class HierarchicalTimingWheel:
+    """
+    Hashed hierarchical timing wheel keyed by opaque ids.
+
+    Level ``n`` has ``slots`` buckets of ``slots ** n`` ticks each. Insert and
+    cancel are O(1); advancing one tick touches the due level-0 bucket and, on
+    wrap-around, cascades one bucket of each higher level down.
+    """
+
+    def __init__(self, slots: int = 512, levels: int = 4, start_tick: int = 0):
+        if slots < 2 or levels < 1:
+            raise ValueError("Timing wheel needs at least 2 slots and 1 level")
+        self._slots = slots
+        self._levels = levels
+        self._spans = [slots**level for level in range(levels + 1)]
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._index = {}
+        self._current = start_tick
+
+    @property
+    def current_tick(self) -> int:
+        return self._current
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def schedule(self, key, tick: int, payload=None):
+        """Insert or move ``key`` so that it expires at ``tick``."""
+        self.cancel(key)
+        self._place(key, tick, payload)
+
+    def cancel(self, key) -> bool:
+        bucket = self._index.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def clear(self):
+        for wheel in self._wheels:
+            for bucket in wheel:
+                bucket.clear()
+        self._index.clear()
+
+    def advance(self, to_tick: int):
+        """Move the wheel forward to ``to_tick`` and return expired ``(key, payload)`` pairs."""
+        expired = []
+        if not self._index:
+            self._current = max(self._current, to_tick)
+            return expired
+
+        while self._current < to_tick:
+            self._current += 1
+            for level in range(self._levels - 1, 0, -1):
+                if self._current % self._spans[level] == 0:
+                    self._cascade(level, expired)
+
+            slot = self._current % self._slots
+            bucket = self._wheels[0][slot]
+            if not bucket:
+                continue
+            self._wheels[0][slot] = {}
+            for key, (tick, payload) in bucket.items():
+                if tick <= self._current:
+                    del self._index[key]
+                    expired.append((key, payload))
+                else:
+                    self._place(key, tick, payload)
+
+            if not self._index:
+                self._current = to_tick
+        return expired
+
+    def _cascade(self, level: int, expired: list):
+        slot = (self._current // self._spans[level]) % self._slots
+        bucket = self._wheels[level][slot]
+        if not bucket:
+            return
+        self._wheels[level][slot] = {}
+        for key, (tick, payload) in bucket.items():
+            if tick <= self._current:
+                del self._index[key]
+                expired.append((key, payload))
+            else:
+                self._place(key, tick, payload)
+
+    def _place(self, key, tick: int, payload):
+        # Anything already due fires on the next advance
+        tick = max(tick, self._current + 1)
+        delta = tick - self._current
+        level = 0
+        while level < self._levels - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        bucket = self._wheels[level][(tick // self._spans[level]) % self._slots]
+        bucket[key] = (tick, payload)
+        self._index[key] = bucket
+
+
+class WheelJob:
+    """Scheduled entry held by :class:`TimingWheelScheduler`."""
+
+    __slots__ = ("id", "func", "trigger", "kwargs", "next_run_time")
+
+    def __init__(self, id, func, trigger, kwargs, next_run_time):
+        self.id = id
+        self.func = func
+        self.trigger = trigger
+        self.kwargs = kwargs
+        self.next_run_time = next_run_time
+
+    def __repr__(self):
+        return f"<WheelJob(id={self.id}, next_run_time={self.next_run_time})>"
+
+
+class TimingWheelScheduler:
+    """
+    In-memory scheduling engine with the subset of the ``BackgroundScheduler``
+    API used by ``SchedulerManager``.
+
+    Jobs live only in the wheel; the only persisted state is ``next_run_at``,
+    handed in batches to ``on_reschedule`` after every tick.
+    """
+
+    def __init__(
+        self,
+        job_defaults: dict = None,
+        tick_seconds: float = 0.1,
+        slots: int = 512,
+        levels: int = 4,
+        max_workers: int = 10,
+        on_reschedule=None,
+    ):
+        job_defaults = job_defaults or {}
+        self.tick_seconds = tick_seconds
+        self.coalesce = job_defaults.get("coalesce", True)
+        self.max_instances = job_defaults.get("max_instances", 1)
+        self.max_workers = max_workers
+        self.on_reschedule = on_reschedule
+
+        self._wheel = HierarchicalTimingWheel(slots, levels, self._tick_for(time.time()))
+        self._jobs = {}
+        self._instances = {}
+        self._pending_updates = []
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._paused = False
+        self._thread = None
+        self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, paused: bool = False):
+        if self.running:
+            return
+        self._paused = paused
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="timing-wheel-worker"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="timing-wheel", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self, wait: bool = True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        self.flush()
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+
+    def add_listener(self, callback, mask=EVENT_ALL):
+        self._listeners.append((callback, mask))
+
+    def add_job(self, func, trigger, id, kwargs=None, replace_existing=False, next_run_time=None):
+        """
+        Like APScheduler's ``add_job``, ``next_run_time`` overrides the trigger's
+        first fire time (e.g. a persisted ``next_run_at``). A time already in the
+        past fires on the next tick.
+        """
+        if next_run_time is None:
+            next_run_time = trigger.get_next_fire_time(None, datetime.now(timezone.utc))
+        job = WheelJob(id, func, trigger, kwargs or {}, next_run_time)
+        with self._lock:
+            if id in self._jobs and not replace_existing:
+                raise ConflictingIdError(id)
+            self._jobs[id] = job
+            if next_run_time is None:
+                self._wheel.cancel(id)
+            else:
+                self._wheel.schedule(id, self._tick_for(next_run_time.timestamp()))
+        return job
+
+    def get_job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def get_jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def remove_job(self, job_id):
+        with self._lock:
+            if self._jobs.pop(job_id, None) is None:
+                raise JobLookupError(job_id)
+            self._wheel.cancel(job_id)
+
+    def remove_all_jobs(self):
+        with self._lock:
+            self._jobs.clear()
+            self._wheel.clear()
+
+    def flush(self):
+        """Hand any buffered ``next_run_at`` updates to ``on_reschedule``."""
+        with self._lock:
+            updates, self._pending_updates = self._pending_updates, []
+        if updates and self.on_reschedule is not None:
+            try:
+                self.on_reschedule(updates)
+            except Exception as e:
+                safe_log(f"Failed to persist next_run_at updates: {e}", level=logging.ERROR)
+
+    def _tick_for(self, timestamp: float) -> int:
+        return math.ceil(timestamp / self.tick_seconds)
+
+    def _run(self):
+        while not self._stop.wait(self.tick_seconds):
+            if self._paused:
+                continue
+            try:
+                self._process_due(datetime.now(timezone.utc))
+            except Exception as e:
+                safe_log(f"Timing wheel tick failed: {e}", level=logging.ERROR)
+            self.flush()
+
+    def _process_due(self, now: datetime):
+        to_submit = []
+        with self._lock:
+            for job_id, _ in self._wheel.advance(self._tick_for(now.timestamp())):
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                scheduled_run_time = job.next_run_time
+                job.next_run_time = self._next_fire_time(job, scheduled_run_time, now)
+                if job.next_run_time is None:
+                    del self._jobs[job_id]
+                else:
+                    self._wheel.schedule(job_id, self._tick_for(job.next_run_time.timestamp()))
+                self._pending_updates.append((job_id, job.next_run_time))
+
+                if self._instances.get(job_id, 0) >= self.max_instances:
+                    safe_log(
+                        f"Execution of job {job_id} skipped: maximum number of running "
+                        f"instances reached ({self.max_instances})",
+                        level=logging.WARNING,
+                    )
+                    self._dispatch(
+                        JobSubmissionEvent(
+                            EVENT_JOB_MAX_INSTANCES, job_id, WHEEL_JOBSTORE, [scheduled_run_time]
+                        )
+                    )
+                    continue
+                self._instances[job_id] = self._instances.get(job_id, 0) + 1
+                to_submit.append((job, scheduled_run_time))
+
+        for job, scheduled_run_time in to_submit:
+            self._executor.submit(self._execute, job, scheduled_run_time)
+            self._dispatch(
+                JobSubmissionEvent(EVENT_JOB_SUBMITTED, job.id, WHEEL_JOBSTORE, [scheduled_run_time])
+            )
+
+    def _next_fire_time(self, job: WheelJob, previous: datetime, now: datetime):
+        next_run_time = job.trigger.get_next_fire_time(previous, now)
+        # Collapse a backlog of missed runs into the single run that just fired
+        while self.coalesce and next_run_time is not None and next_run_time <= now:
+            next_run_time = job.trigger.get_next_fire_time(next_run_time, now)
+        return next_run_time
+
+    def _execute(self, job: WheelJob, scheduled_run_time: datetime):
+        try:
+            retval = job.func(**job.kwargs)
+        except BaseException as e:
+            event = JobExecutionEvent(
+                EVENT_JOB_ERROR,
+                job.id,
+                WHEEL_JOBSTORE,
+                scheduled_run_time,
+                exception=e,
+                traceback=traceback.format_exc(),
+            )
+            safe_log(f"Job {job.id} raised an exception: {e}", level=logging.ERROR)
+        else:
+            event = JobExecutionEvent(
+                EVENT_JOB_EXECUTED, job.id, WHEEL_JOBSTORE, scheduled_run_time, retval=retval
+            )
+        finally:
+            with self._lock:
+                remaining = self._instances.get(job.id, 1) - 1
+                if remaining:
+                    self._instances[job.id] = remaining
+                else:
+                    self._instances.pop(job.id, None)
+        self._dispatch(event)
+
+    def _dispatch(self, event):
+        for callback, mask in list(self._listeners):
+            if event.code & mask:
+                try:
+                    callback(event)
+                except Exception as e:
+                    safe_log(f"Scheduler listener failed: {e}", level=logging.ERROR)
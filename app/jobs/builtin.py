@@ -3,8 +3,13 @@ import traceback
 import uuid
 from datetime import datetime, timezone
 
-from app.core.database import SessionLocal
+from sqlalchemy import update
+
+from app.core.cache import job_cache
+from app.core.database import SessionLocal, engine
 from app.core.logger import safe_log
+from app.core.profiling import stage
+from app.core.sqlite_writer import writer_for
 from app.jobs.registry import register_job
 from app.models.job import Job, JobStatus
 
@@ -12,20 +17,28 @@ from app.models.job import Job, JobStatus
 @register_job("dummy_number_crunch")
 def dummy_number_crunch(job_id: str, job_metadata: dict = None):
     try:
-        with SessionLocal() as db_session:
+        with stage("db_fetch"), SessionLocal() as db_session:
             job_uuid = uuid.UUID(job_id)
             job = db_session.query(Job).filter(Job.id == job_uuid).first()
 
             if not job:
-                safe_log(f"Job {job_id} not found in DB", level=logging.ERROR)
-                return
+                raise LookupError(f"Job {job_id} not found in DB")
+
+            now = datetime.now(timezone.utc)
+            next_run_at = job.compute_next_run(from_time=now)
 
+        with stage("work"):
             multiplier = job_metadata.get("multiplier", 1) if job_metadata else 1
             result = sum(range(100)) * multiplier
 
-            job.update_last_run()
-            db_session.commit()
+        # Bookkeeping goes through the writer so it is group-committed on SQLite
+        with stage("commit"):
+            table = Job.__table__
+            stmt = update(table).where(table.c.id == job_uuid).values(last_run_at=now, next_run_at=next_run_at)
+            writer_for(engine).execute(lambda conn: conn.execute(stmt))
+            job_cache.invalidate(job_id)
 
+        with stage("log"):
             safe_log(
                 f"[{datetime.now(timezone.utc)}] Executed Job {job_id} "
                 f"| Result={result} | Metadata={job_metadata}"
@@ -36,19 +49,20 @@ def dummy_number_crunch(job_id: str, job_metadata: dict = None):
         safe_log(traceback.format_exc(), level=logging.ERROR)
 
         try:
-            with SessionLocal() as db_session:
-                job_uuid = uuid.UUID(job_id)
-                job = db_session.query(Job).filter(Job.id == job_uuid).first()
-                if job:
-                    job.status = JobStatus.FAILED
-                    db_session.commit()
-                    safe_log(f"Job {job_id} marked as FAILED in DB")
+            table = Job.__table__
+            stmt = update(table).where(table.c.id == uuid.UUID(job_id)).values(status=JobStatus.FAILED)
+            marked = writer_for(engine).execute(lambda conn: conn.execute(stmt).rowcount)
+            if marked:
+                job_cache.invalidate(job_id)
+                safe_log(f"Job {job_id} marked as FAILED in DB")
         except Exception as inner_e:
             safe_log(
                 f"Failed to mark Job {job_id} as FAILED: {str(inner_e)}",
                 level=logging.ERROR,
             )
             safe_log(traceback.format_exc(), level=logging.ERROR)
+        # Re-raise so the run is reported as failed: no job.executed event and no downstream trigger
+        raise
 
 @register_job("print_hello")
 def print_hello(job_id: str, job_metadata: dict = None):
@@ -1,7 +1,129 @@
+import functools
+import importlib
+import logging
+import threading
+from importlib.metadata import entry_points
+
+from app.core.config import settings
+from app.core.logger import safe_log
+from app.core.profiling import job_profiler
+
+JOB_ENTRY_POINT_GROUP = "scheduler.jobs"
+
+# function_name -> callable; either a register_job wrapper or a LazyJobRef not imported yet
 JOB_REGISTRY = {}
 
+
+class JobNotAllowedError(Exception):
+    """Raised when a function is outside this worker's ``JOB_WORKER_ALLOWLIST``."""
+
+
+def _wrap(name: str, func):
+    # Returned wrapper replaces the module attribute so APScheduler's textual references still resolve
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return job_profiler.run(name, func, *args, **kwargs)
+
+    wrapper.__job_name__ = name
+    return wrapper
+
+
+class LazyJobRef:
+    """
+    A ``"module:attribute"`` job reference that imports its module on first call.
+
+    Once resolved it replaces itself in ``JOB_REGISTRY`` with the real function,
+    so only the first execution pays for the import.
+    """
+
+    __slots__ = ("name", "target", "_func", "_lock")
+
+    def __init__(self, name: str, target: str):
+        self.name = name
+        self.target = target
+        self._func = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<LazyJobRef {self.name} -> {self.target}>"
+
+    @property
+    def resolved(self) -> bool:
+        return self._func is not None
+
+    def resolve(self):
+        if self._func is None:
+            with self._lock:
+                if self._func is None:
+                    module_name, _, attribute = self.target.partition(":")
+                    func = importlib.import_module(module_name)
+                    for part in attribute.split("."):
+                        func = getattr(func, part)
+                    if getattr(func, "__job_name__", None) != self.name:
+                        func = _wrap(self.name, func)
+                    self._func = func
+                    JOB_REGISTRY[self.name] = func
+                    safe_log(f"Imported job function '{self.name}' from {self.target}")
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+
 def register_job(name: str):
     def decorator(func):
-        JOB_REGISTRY[name] = func
-        return func
+        wrapper = _wrap(name, func)
+        JOB_REGISTRY[name] = wrapper
+        return wrapper
     return decorator
+
+
+def register_lazy(name: str, target: str):
+    """Register ``target`` under ``name`` without importing it; already imported functions win."""
+    current = JOB_REGISTRY.get(name)
+    if current is None or isinstance(current, LazyJobRef):
+        JOB_REGISTRY[name] = LazyJobRef(name, target)
+
+
+def discover_jobs(functions: dict = None, plugins=None):
+    """
+    Fill ``JOB_REGISTRY`` with lazy references from installed ``scheduler.jobs``
+    entry points and then ``JOB_FUNCTIONS`` (which wins on name clashes).
+    Nothing is imported until a function first runs.
+    """
+    if plugins is None:
+        plugins = entry_points(group=JOB_ENTRY_POINT_GROUP)
+    for plugin in plugins:
+        register_lazy(plugin.name, plugin.value)
+    for name, target in (settings.JOB_FUNCTIONS if functions is None else functions).items():
+        register_lazy(name, target)
+
+
+def is_allowed(name: str) -> bool:
+    """Whether this worker runs ``name``; every function is allowed without an allowlist."""
+    allowlist = settings.JOB_WORKER_ALLOWLIST
+    return allowlist is None or name in allowlist
+
+
+def get_job_function(name: str):
+    """
+    Look up a function this worker may run. Raises ``KeyError`` for unknown
+    names and ``JobNotAllowedError`` for names outside the allowlist.
+    """
+    func = JOB_REGISTRY[name]
+    if not is_allowed(name):
+        raise JobNotAllowedError(f"Function {name} is not run by this worker")
+    return func
+
+
+def run_registered_job(function_name: str, job_id: str, job_metadata: dict = None):
+    """Module-level entry point handed to the scheduler, so persisted jobs never reference a job module directly."""
+    try:
+        func = get_job_function(function_name)
+    except (KeyError, JobNotAllowedError) as e:
+        safe_log(f"Cannot run job {job_id}: {e}", level=logging.ERROR)
+        raise
+    return func(job_id=job_id, job_metadata=job_metadata)
+
+
+discover_jobs()
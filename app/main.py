@@ -1,19 +1,49 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-import app.jobs.builtin
-from app.api import jobs
+from app.api import admin, events, jobs
+from app.core.admission import AdmissionControlMiddleware, read_limiter, write_limiter
+from app.core.config import settings
 from app.core.database import SessionLocal, engine
+from app.core.events import event_bus
+from app.core.metadata_query import ensure_metadata_indexes
+from app.core.migrations import run_migrations
 from app.core.scheduler import scheduler_manager
-from app.models.job import Base
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Bring the schema up to date
+run_migrations(engine)
+ensure_metadata_indexes(engine, settings.JOB_METADATA_INDEXED_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    scheduler_manager.start()
+    # Load and schedule existing active jobs from DB
+    with SessionLocal() as db:
+        scheduler_manager.load_existing_jobs(db_session=db)
+    yield
+    event_bus.close()
+    scheduler_manager.shutdown()
+
 
-# Load and schedule existing active jobs from DB
-with SessionLocal() as db:
-    scheduler_manager.load_existing_jobs(db_session=db)
+app = FastAPI(
+    title="Interval Scheduler Microservice",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
-app = FastAPI(title="Interval Scheduler Microservice", version="0.1.0")
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        read_limiter=read_limiter,
+        write_limiter=write_limiter,
+        exempt_paths=settings.ADMISSION_EXEMPT_PATHS,
+    )
 
 # Include routes
 app.include_router(jobs.router)
+app.include_router(events.router)
+app.include_router(admin.router)
@@ -4,44 +4,92 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy import JSON, CheckConstraint, Column, DateTime
 from sqlalchemy import Enum as SqlEnum
-from sqlalchemy import Integer, String
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import ForeignKey, Index, Integer, String, Table, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import declarative_base, relationship
 
 from app.core.logger import safe_log
+from app.models.types import GUID
 
 Base = declarative_base()
 
 
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands datetimes back naive; they are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 class JobStatus(str, Enum):
     ACTIVE = "active"
     PAUSED = "paused"
     FAILED = "failed"
+    COMPLETED = "completed"
+
+
+# job_id runs after every job it depends_on has succeeded
+job_dependencies = Table(
+    "job_dependencies",
+    Base.metadata,
+    Column("job_id", GUID(), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    Column("depends_on_id", GUID(), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_job_dependencies_depends_on_id", "depends_on_id"),
+)
 
 
 class Job(Base):
     __tablename__ = "jobs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     interval_seconds = Column(Integer, nullable=True)
     cron_expression = Column(String, nullable=True)
-    function_name = Column(String, nullable=False)
+    run_at = Column(DateTime, nullable=True)
+    function_name = Column(String, nullable=False, index=True)
     last_run_at = Column(DateTime, nullable=True)
-    next_run_at = Column(DateTime, nullable=True)
-    job_metadata = Column(JSON, default=dict)
-    status = Column(SqlEnum(JobStatus), nullable=False, default=JobStatus.ACTIVE)
-
+    next_run_at = Column(DateTime, nullable=True, index=True)
+    job_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), default=dict)
+    status = Column(SqlEnum(JobStatus), nullable=False, default=JobStatus.ACTIVE, index=True)
+
+    upstream_jobs = relationship(
+        "Job",
+        secondary=job_dependencies,
+        primaryjoin=lambda: Job.id == job_dependencies.c.job_id,
+        secondaryjoin=lambda: Job.id == job_dependencies.c.depends_on_id,
+        back_populates="downstream_jobs",
+    )
+    downstream_jobs = relationship(
+        "Job",
+        secondary=job_dependencies,
+        primaryjoin=lambda: Job.id == job_dependencies.c.depends_on_id,
+        secondaryjoin=lambda: Job.id == job_dependencies.c.job_id,
+        back_populates="upstream_jobs",
+    )
 
     __table_args__ = (
         CheckConstraint(
-            "(interval_seconds IS NOT NULL AND cron_expression IS NULL) OR "
-            "(interval_seconds IS NULL AND cron_expression IS NOT NULL)",
-            name="check_interval_or_cron_only",
+            "(CASE WHEN interval_seconds IS NOT NULL THEN 1 ELSE 0 END"
+            " + CASE WHEN cron_expression IS NOT NULL THEN 1 ELSE 0 END"
+            " + CASE WHEN run_at IS NOT NULL THEN 1 ELSE 0 END) <= 1",
+            name="check_single_schedule",
+        ),
+        # Only active jobs are ever due; the partial index stays small as paused/failed jobs pile up
+        Index(
+            "ix_jobs_active_next_run_at",
+            "next_run_at",
+            sqlite_where=text("status = 'ACTIVE'"),
+            postgresql_where=text("status = 'ACTIVE'"),
         ),
+        # Serves ?meta.<key>= containment queries; SQLite gets generated columns at startup instead
+        Index(
+            "ix_jobs_job_metadata_gin",
+            "job_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"job_metadata": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
     
     def __init__(self, **kwargs):
@@ -54,6 +102,8 @@ class Job(Base):
             schedule_part = f"interval={self.interval_seconds}s"
         elif self.cron_expression is not None:
             schedule_part = f"cron='{self.cron_expression}'"
+        elif self.run_at is not None:
+            schedule_part = f"run_at={self.run_at.isoformat()}"
         else:
             schedule_part = "unscheduled"
 
@@ -66,10 +116,23 @@ class Job(Base):
         )
 
 
+    @property
+    def depends_on(self) -> list:
+        return sorted((upstream.id for upstream in self.upstream_jobs), key=str)
+
+    @property
+    def is_one_shot(self) -> bool:
+        return self.run_at is not None
+
     def compute_next_run(self, from_time: datetime = None):
-        """Compute the next_run_at from interval or cron, without touching last_run_at."""
+        """Compute the next_run_at from interval, cron or run_at, without touching last_run_at."""
         now = from_time or datetime.now(timezone.utc)
 
+        if self.run_at is not None:
+            # One-shot jobs have nothing left to run once they ran at or after run_at
+            if self.last_run_at and _as_utc(self.last_run_at) >= _as_utc(self.run_at):
+                return None
+            return self.run_at
         if self.interval_seconds:
             return now + timedelta(seconds=self.interval_seconds)
         if self.cron_expression:
@@ -87,6 +150,8 @@ class Job(Base):
         self.next_run_at = self.compute_next_run(from_time=now)
 
     def get_trigger(self):
+        if self.run_at is not None:
+            return DateTrigger(run_date=self.run_at, timezone=timezone.utc)
         if self.interval_seconds:
             return IntervalTrigger(seconds=self.interval_seconds, timezone=timezone.utc)
         if self.cron_expression:
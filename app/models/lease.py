@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, String, Table
+
+from app.models.job import Base
+
+# One row per lease name; the owner is the replica allowed to fire scheduled jobs
+scheduler_leases = Table(
+    "scheduler_leases",
+    Base.metadata,
+    Column("name", String, primary_key=True),
+    Column("owner", String, nullable=True),
+    Column("expires_at", DateTime, nullable=True),
+)
@@ -0,0 +1,33 @@
+import uuid
+
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """
+    UUID column stored natively on PostgreSQL and as 16 raw bytes elsewhere,
+    so SQLite keys are compact and compare as plain blobs.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == "postgresql":
+            return value
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(bytes=bytes(value))
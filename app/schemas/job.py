@@ -1,53 +1,158 @@
-from typing import Dict, Optional
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from app.models.job import JobStatus
 
 
+SCHEDULE_FIELDS = ("interval_seconds", "cron_expression", "run_at")
+
+
+def to_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize to aware UTC; naive datetimes are taken to already be UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 class JobCreate(BaseModel):
     name: str
     function_name: str  
     interval_seconds: Optional[int] = None
     cron_expression: Optional[str] = None
+    run_at: Optional[datetime] = None
     job_metadata: Dict = Field(default_factory=dict)
     status: Optional[JobStatus] = JobStatus.ACTIVE
+    depends_on: List[uuid.UUID] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
 
     @model_validator(mode="before")
     @classmethod
     def validate_one_schedule(cls, values: dict) -> dict:
-        interval = values.get("interval_seconds") is not None
-        cron = values.get("cron_expression") is not None
+        provided = [field for field in SCHEDULE_FIELDS if values.get(field) is not None]
 
-        # Both True or both False -> invalid
-        if interval == cron:
+        # Jobs that depend on others are triggered by them and may have no schedule
+        if len(provided) > 1 or (not provided and not values.get("depends_on")):
             raise ValueError(
-                "Exactly one of 'interval_seconds' or 'cron_expression' must be provided"
+                "Exactly one of 'interval_seconds', 'cron_expression' or 'run_at' must be provided "
+                "(or none, when 'depends_on' is set)"
             )
         return values
 
+    @field_validator("run_at")
+    @classmethod
+    def normalize_run_at(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return to_utc(value)
+
 
 class JobUpdate(BaseModel):
     name: Optional[str] = None
     function_name: Optional[str] = None
     interval_seconds: Optional[int] = None
     cron_expression: Optional[str] = None
+    run_at: Optional[datetime] = None
     job_metadata: Optional[Dict] = None
     status: Optional[JobStatus] = None
+    depends_on: Optional[List[uuid.UUID]] = None
 
     model_config = ConfigDict(from_attributes=True)
 
     @model_validator(mode="before")
     @classmethod
     def validate_one_schedule(cls, values: dict) -> dict:
-        interval = values.get("interval_seconds") is not None
-        cron = values.get("cron_expression") is not None
+        provided = [field for field in SCHEDULE_FIELDS if values.get(field) is not None]
 
-        # In PATCH we only block if both are set together
-        if interval and cron:
+        # In PATCH we only block if several are set together
+        if len(provided) > 1:
             raise ValueError(
-                "Only one of 'interval_seconds' or 'cron_expression' can be provided"
+                "Only one of 'interval_seconds', 'cron_expression' or 'run_at' can be provided"
             )
         return values
+
+    @field_validator("run_at")
+    @classmethod
+    def normalize_run_at(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return to_utc(value)
+
+
+class JobRead(BaseModel):
+    id: uuid.UUID
+    name: str
+    function_name: str
+    interval_seconds: Optional[int] = None
+    cron_expression: Optional[str] = None
+    run_at: Optional[datetime] = None
+    job_metadata: Optional[Dict] = None
+    status: JobStatus
+    last_run_at: Optional[datetime] = None
+    next_run_at: Optional[datetime] = None
+    depends_on: List[uuid.UUID] = Field(default_factory=list)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobGraphNode(BaseModel):
+    id: uuid.UUID
+    name: str
+    function_name: str
+    status: JobStatus
+
+
+class JobGraphEdge(BaseModel):
+    upstream: uuid.UUID
+    downstream: uuid.UUID
+
+
+class JobGraph(BaseModel):
+    job_id: uuid.UUID
+    nodes: List[JobGraphNode]
+    edges: List[JobGraphEdge]
+
+
+class JobRunQueued(BaseModel):
+    job_id: uuid.UUID
+    status: str
+
+
+class JobDeleted(BaseModel):
+    message: str
+
+
+class JobsDeleted(BaseModel):
+    message: str
+    deleted_count: int
+
+
+_JOB_FIELDS = tuple(field for field in JobRead.model_fields if field != "depends_on")
+_DATETIME_FIELDS = ("run_at", "last_run_at", "next_run_at")
+
+
+def serialize_job(job, depends_on=None) -> dict:
+    """
+    Serialize a `Job` (or a row with the same columns) to the JSON-ready shape
+    of `JobRead`. Values come from the database already typed, so this skips
+    per-field validation; the output matches `JobRead.model_dump(mode="json")`.
+    Rows carry no relationships, so pass their ``depends_on`` ids explicitly.
+    """
+    payload = {field: getattr(job, field) for field in _JOB_FIELDS}
+    payload["id"] = str(payload["id"])
+    payload["status"] = JobStatus(payload["status"]).value
+    for field in _DATETIME_FIELDS:
+        value = payload[field]
+        if value is not None:
+            payload[field] = value.isoformat()
+    if depends_on is None:
+        depends_on = getattr(job, "depends_on", ())
+    payload["depends_on"] = sorted(str(upstream) for upstream in depends_on)
+    return payload
+
+
+def serialize_jobs(rows, depends_on: dict = None) -> list:
+    """Serialize rows; ``depends_on`` maps a job id (str) to its upstream ids."""
+    depends_on = depends_on or {}
+    return [serialize_job(row, depends_on.get(str(row.id), ())) for row in rows]
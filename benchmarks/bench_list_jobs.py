@@ -0,0 +1,88 @@
+"""
+Serialization cost of GET /jobs over a large table.
+
+Compares the old path (ORM objects through FastAPI's jsonable_encoder and the
+stdlib JSON response) with the current one (plain rows through serialize_jobs,
+rendered with orjson or msgpack).
+
+    python -m benchmarks.bench_list_jobs --rows 100000
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+import msgpack
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.job import Base, Job, JobStatus
+from app.schemas.job import serialize_jobs
+
+
+def seed(engine, rows: int):
+    now = datetime.now(timezone.utc)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Job.__table__),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "name": f"Job {i}",
+                    "function_name": "dummy_number_crunch",
+                    "interval_seconds": 60,
+                    "job_metadata": {"multiplier": i, "text": f"Hello {i}", "tenant": f"t{i % 50}"},
+                    "status": JobStatus.ACTIVE,
+                    "next_run_at": now,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+def legacy(engine) -> bytes:
+    with Session(engine) as db:
+        jobs = db.query(Job).all()
+        return json.dumps(jsonable_encoder(jobs)).encode()
+
+
+def current_json(engine) -> bytes:
+    with Session(engine) as db:
+        rows = db.execute(select(Job.__table__)).all()
+        return orjson.dumps(serialize_jobs(rows))
+
+
+def current_msgpack(engine) -> bytes:
+    with Session(engine) as db:
+        rows = db.execute(select(Job.__table__)).all()
+        return msgpack.packb(serialize_jobs(rows), use_bin_type=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    seed(engine, args.rows)
+    print(f"list_jobs serialization ({args.rows:,} rows, best of {args.repeat})")
+    for label, func in (
+        ("ORM + jsonable_encoder + json", legacy),
+        ("rows + serialize_jobs + orjson", current_json),
+        ("rows + serialize_jobs + msgpack", current_msgpack),
+    ):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            body = func(engine)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:<32} {best:8.3f}s  {len(body) / 2**20:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+import app.models.lease  # noqa: F401  (registers scheduler_leases on Base.metadata)
+from app.core.config import settings
+from app.core.migrations import include_object
+from app.models.job import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+        include_object=include_object(make_url(settings.DATABASE_URL).get_backend_name()),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # app.core.migrations passes the application's connection in; the alembic CLI does not
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object(connection.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object(connection.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,50 @@
+"""Create jobs table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Databases created before migrations existed (via Base.metadata.create_all)
+already have the table; for them this revision is only recorded.
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.models.types import GUID
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("jobs"):
+        return
+    op.create_table(
+        "jobs",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("interval_seconds", sa.Integer(), nullable=True),
+        sa.Column("cron_expression", sa.String(), nullable=True),
+        sa.Column("function_name", sa.String(), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("next_run_at", sa.DateTime(), nullable=True),
+        sa.Column("job_metadata", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("ACTIVE", "PAUSED", "FAILED", name="jobstatus"),
+            nullable=False,
+        ),
+        sa.CheckConstraint(
+            "(interval_seconds IS NOT NULL AND cron_expression IS NULL) OR "
+            "(interval_seconds IS NULL AND cron_expression IS NOT NULL)",
+            name="check_interval_or_cron_only",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("jobs")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
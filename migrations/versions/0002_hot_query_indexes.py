@@ -0,0 +1,39 @@
+"""Index the columns the scheduler and API filter on
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+- status: load_existing_jobs loads every active job on startup
+- next_run_at: due-job scans, plus a partial index covering active jobs only
+- function_name: lookups of every job bound to a registered function
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+ACTIVE_ONLY = sa.text("status = 'ACTIVE'")
+
+
+def upgrade():
+    op.create_index("ix_jobs_status", "jobs", ["status"])
+    op.create_index("ix_jobs_next_run_at", "jobs", ["next_run_at"])
+    op.create_index("ix_jobs_function_name", "jobs", ["function_name"])
+    op.create_index(
+        "ix_jobs_active_next_run_at",
+        "jobs",
+        ["next_run_at"],
+        sqlite_where=ACTIVE_ONLY,
+        postgresql_where=ACTIVE_ONLY,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_jobs_active_next_run_at", table_name="jobs")
+    op.drop_index("ix_jobs_function_name", table_name="jobs")
+    op.drop_index("ix_jobs_next_run_at", table_name="jobs")
+    op.drop_index("ix_jobs_status", table_name="jobs")
@@ -0,0 +1,43 @@
+"""Store SQLite job ids as 16-byte blobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+The postgres UUID type used to fall back to 32-character hex strings on
+SQLite. The GUID type stores raw bytes instead; convert existing rows.
+PostgreSQL already uses the native uuid type and is left alone.
+"""
+import uuid
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    rows = bind.execute(sa.text("SELECT id FROM jobs WHERE typeof(id) = 'text'")).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE jobs SET id = :new_id WHERE id = :old_id"),
+            [{"new_id": uuid.UUID(old_id).bytes, "old_id": old_id} for (old_id,) in rows],
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    rows = bind.execute(sa.text("SELECT id FROM jobs WHERE typeof(id) = 'blob'")).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE jobs SET id = :new_id WHERE id = :old_id"),
+            [{"new_id": uuid.UUID(bytes=old_id).hex, "old_id": old_id} for (old_id,) in rows],
+        )
@@ -0,0 +1,62 @@
+"""One-shot jobs: run_at column and completed status
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+A job now has exactly one of interval_seconds, cron_expression or run_at.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.migrations import drop_generated_columns
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SINGLE_SCHEDULE = (
+    "(CASE WHEN interval_seconds IS NOT NULL THEN 1 ELSE 0 END"
+    " + CASE WHEN cron_expression IS NOT NULL THEN 1 ELSE 0 END"
+    " + CASE WHEN run_at IS NOT NULL THEN 1 ELSE 0 END) = 1"
+)
+OLD_STATUS = sa.Enum("ACTIVE", "PAUSED", "FAILED", name="jobstatus")
+NEW_STATUS = sa.Enum("ACTIVE", "PAUSED", "FAILED", "COMPLETED", name="jobstatus")
+INTERVAL_OR_CRON = (
+    "(interval_seconds IS NOT NULL AND cron_expression IS NULL) OR "
+    "(interval_seconds IS NULL AND cron_expression IS NOT NULL)"
+)
+
+
+def upgrade():
+    native_enum = op.get_bind().dialect.name == "postgresql"
+    if native_enum:
+        # Allowed inside a transaction on PostgreSQL 12+ as long as the value is not used in it
+        op.execute("ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'COMPLETED'")
+
+    drop_generated_columns()
+    checks = {c["name"] for c in sa.inspect(op.get_bind()).get_check_constraints("jobs")}
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("run_at", sa.DateTime(), nullable=True))
+        if not native_enum:
+            # Elsewhere the enum is a VARCHAR sized to its longest value, too short for COMPLETED
+            batch_op.alter_column("status", type_=NEW_STATUS, existing_type=OLD_STATUS, existing_nullable=False)
+        if "check_interval_or_cron_only" in checks:
+            batch_op.drop_constraint("check_interval_or_cron_only", type_="check")
+        batch_op.create_check_constraint("check_single_schedule", SINGLE_SCHEDULE)
+
+
+def downgrade():
+    native_enum = op.get_bind().dialect.name == "postgresql"
+    op.execute("DELETE FROM jobs WHERE run_at IS NOT NULL")
+    if not native_enum:
+        op.execute("UPDATE jobs SET status = 'FAILED' WHERE status = 'COMPLETED'")
+    drop_generated_columns()
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_constraint("check_single_schedule", type_="check")
+        batch_op.create_check_constraint("check_interval_or_cron_only", INTERVAL_OR_CRON)
+        batch_op.drop_column("run_at")
+        if not native_enum:
+            batch_op.alter_column("status", type_=OLD_STATUS, existing_type=NEW_STATUS, existing_nullable=False)
+    # PostgreSQL cannot drop enum values; COMPLETED stays in jobstatus unused
@@ -0,0 +1,26 @@
+"""Scheduler ownership lease
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scheduler_leases",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("owner", sa.String(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("scheduler_leases")
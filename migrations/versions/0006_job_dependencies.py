@@ -0,0 +1,52 @@
+"""Job dependencies
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+Jobs may depend on other jobs. A job with dependencies needs no schedule of
+its own, so the schedule check becomes "at most one".
+
+On SQLite the generated metadata columns are dropped to rebuild the table.
+They are re-created at app startup by ensure_metadata_indexes, not by Alembic.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.migrations import drop_generated_columns
+from app.models.types import GUID
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+SCHEDULE_COUNT = (
+    "(CASE WHEN interval_seconds IS NOT NULL THEN 1 ELSE 0 END"
+    " + CASE WHEN cron_expression IS NOT NULL THEN 1 ELSE 0 END"
+    " + CASE WHEN run_at IS NOT NULL THEN 1 ELSE 0 END)"
+)
+
+
+def upgrade():
+    drop_generated_columns()
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_constraint("check_single_schedule", type_="check")
+        batch_op.create_check_constraint("check_single_schedule", f"{SCHEDULE_COUNT} <= 1")
+
+    op.create_table(
+        "job_dependencies",
+        sa.Column("job_id", GUID(), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("depends_on_id", GUID(), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_job_dependencies_depends_on_id", "job_dependencies", ["depends_on_id"])
+
+
+def downgrade():
+    op.drop_index("ix_job_dependencies_depends_on_id", table_name="job_dependencies")
+    op.drop_table("job_dependencies")
+    op.execute(f"DELETE FROM jobs WHERE {SCHEDULE_COUNT} = 0")
+    drop_generated_columns()
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_constraint("check_single_schedule", type_="check")
+        batch_op.create_check_constraint("check_single_schedule", f"{SCHEDULE_COUNT} = 1")
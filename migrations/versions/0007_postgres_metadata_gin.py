@@ -0,0 +1,50 @@
+"""PostgreSQL metadata GIN index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+
+Makes job_metadata JSONB and adds a jsonb_path_ops GIN index for ?meta.<key>=
+filters. Both used to be ad-hoc DDL run by ensure_metadata_indexes on every
+startup, so databases it already converted are left as they are. Other dialects
+are untouched: SQLite's generated columns depend on configuration and stay in
+ensure_metadata_indexes.
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+GIN_INDEX_NAME = "ix_jobs_job_metadata_gin"
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "jobs",
+        "job_metadata",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="job_metadata::jsonb",
+    )
+    op.create_index(
+        GIN_INDEX_NAME,
+        "jobs",
+        ["job_metadata"],
+        postgresql_using="gin",
+        postgresql_ops={"job_metadata": "jsonb_path_ops"},
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    # The column stays JSONB: 0001 already declares it that way on PostgreSQL
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index(GIN_INDEX_NAME, table_name="jobs", if_exists=True)
@@ -0,0 +1,23 @@
+import os
+import shutil
+import tempfile
+
+# Point the session at a throwaway database and log before anything imports app.core.config
+TEST_DIR = tempfile.mkdtemp(prefix="scheduler-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{TEST_DIR}/scheduler.db")
+os.environ["LOG_FILE"] = os.path.join(TEST_DIR, "scheduler.log")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_lifespan():
+    # Run startup/shutdown once so the scheduler is live for every test
+    with TestClient(app):
+        yield
+    engine.dispose()
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdaptiveLimiter, AdmissionControlMiddleware, AdmissionRejected
+from app.main import app
+
+client = TestClient(app)
+
+
+def make_limiter(**overrides):
+    options = dict(
+        initial_limit=1,
+        min_limit=1,
+        max_limit=10,
+        max_queue=1,
+        queue_timeout=0.2,
+        latency_target=0.1,
+    )
+    options.update(overrides)
+    return AdaptiveLimiter("test", **options)
+
+
+def test_full_queue_is_rejected_with_429():
+    limiter = make_limiter()
+
+    async def scenario():
+        await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await limiter.acquire()
+        limiter.release(0.01)
+        await waiting
+        limiter.release(0.01)
+        return excinfo.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.retry_after == 1
+    assert limiter.in_flight == 0
+
+
+def test_queue_wait_times_out_with_503():
+    limiter = make_limiter(queue_timeout=0.05)
+
+    async def scenario():
+        await limiter.acquire()
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await limiter.acquire()
+        limiter.release(0.01)
+        return excinfo.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert limiter.queued == 0
+    assert limiter.timed_out == 1
+
+
+def test_limit_backs_off_on_slow_requests_and_grows_on_fast_ones():
+    now = [0.0]
+    limiter = make_limiter(initial_limit=8, min_limit=2, clock=lambda: now[0])
+
+    limiter._in_flight = 1
+    limiter.release(0.5)
+    assert limiter.limit == 7  # 8 * 0.9
+
+    limiter._in_flight = 1
+    limiter.release(0.5)  # same instant: one decrease per target interval
+    assert limiter.limit == 7
+
+    for _ in range(20):
+        limiter._in_flight = 1
+        limiter.release(0.01)
+    assert limiter.limit == 9
+
+
+def test_slot_handed_to_waiter_on_another_loop():
+    limiter = make_limiter(queue_timeout=2)
+    asyncio.run(limiter.acquire())
+    admitted = threading.Event()
+
+    def wait_in_other_loop():
+        asyncio.run(limiter.acquire())
+        admitted.set()
+
+    thread = threading.Thread(target=wait_in_other_loop)
+    thread.start()
+    while limiter.queued == 0:
+        pass
+    limiter.release(0.01)
+    thread.join(timeout=2)
+
+    assert admitted.is_set()
+    assert limiter.in_flight == 1
+
+
+def test_middleware_sheds_excess_mutations():
+    release = threading.Event()
+    entered = threading.Event()
+    shed_app = FastAPI()
+
+    @shed_app.post("/work")
+    def work():
+        entered.set()
+        release.wait(timeout=5)
+        return {"ok": True}
+
+    @shed_app.get("/work")
+    def read_work():
+        return {"ok": True}
+
+    shed_app.add_middleware(
+        AdmissionControlMiddleware,
+        read_limiter=make_limiter(),
+        write_limiter=make_limiter(max_queue=0),
+    )
+    shed_client = TestClient(shed_app)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(shed_client.post, "/work")
+        assert entered.wait(timeout=5)
+
+        rejected = shed_client.post("/work")
+        assert rejected.status_code == 429
+        assert rejected.headers["retry-after"] == "1"
+        # Reads have their own budget
+        assert shed_client.get("/work").status_code == 200
+
+        release.set()
+        assert first.result().status_code == 200
+
+
+def test_admission_stats_endpoint():
+    response = client.get("/admin/admission")
+    assert response.status_code == 200
+    assert {"limit", "in_flight", "queued", "rejected"} <= response.json()["read"].keys()
@@ -0,0 +1,108 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.cache import FakeSharedBackend, JobCache, LocalLRUBackend, job_cache
+from app.main import app
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def create_job_payload():
+    return {
+        "name": "Cached Job",
+        "function_name": "print_hello",
+        "interval_seconds": 30,
+        "job_metadata": {"text": "cached"},
+        "status": "paused"
+    }
+
+
+def test_local_backend_evicts_least_recently_used():
+    backend = LocalLRUBackend(max_entries=2, ttl_seconds=60)
+    backend.set("a", {"v": 1})
+    backend.set("b", {"v": 2})
+    backend.get("a")
+    backend.set("c", {"v": 3})
+
+    assert backend.get("b") is None
+    assert backend.get("a") == {"v": 1}
+    assert backend.get("c") == {"v": 3}
+    assert len(backend) == 2
+
+
+def test_local_backend_expires_entries():
+    clock = FakeClock()
+    backend = LocalLRUBackend(max_entries=10, ttl_seconds=5, clock=clock)
+    backend.set("a", {"v": 1})
+    clock.now = 4.9
+    assert backend.get("a") == {"v": 1}
+    clock.now = 5.0
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_stale_read_is_not_cached_after_invalidation():
+    cache = JobCache(LocalLRUBackend(max_entries=10, ttl_seconds=60))
+    token = cache.begin_read("job")
+    cache.invalidate("job")  # a writer commits while the reader is querying
+    cache.set("job", {"name": "old"}, token)
+    assert cache.get("job") is None
+
+    token = cache.begin_read("job")
+    cache.set("job", {"name": "new"}, token)
+    assert cache.get("job") == {"name": "new"}
+
+
+def test_shared_backend_invalidation_reaches_other_replicas():
+    store = {}
+    replica_a = JobCache(FakeSharedBackend(ttl_seconds=60, store=store))
+    replica_b = JobCache(FakeSharedBackend(ttl_seconds=60, store=store))
+
+    replica_a.set("job", {"name": "v1"})
+    assert replica_b.get("job") == {"name": "v1"}
+
+    replica_b.invalidate("job")
+    assert replica_a.get("job") is None
+
+
+def test_hit_ratio():
+    cache = JobCache(LocalLRUBackend(max_entries=10, ttl_seconds=60))
+    cache.get("job")
+    cache.set("job", {"name": "v1"})
+    cache.get("job")
+    cache.get("job")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+def test_get_job_served_from_cache_and_invalidated_on_patch(create_job_payload):
+    job_id = client.post("/jobs", json=create_job_payload).json()["id"]
+
+    hits_before = job_cache.hits
+    assert client.get(f"/jobs/{job_id}").json()["name"] == "Cached Job"
+    assert client.get(f"/jobs/{job_id}").json()["name"] == "Cached Job"
+    assert job_cache.hits == hits_before + 1
+
+    client.patch(f"/jobs/{job_id}", json={"name": "Renamed Job"})
+    assert client.get(f"/jobs/{job_id}").json()["name"] == "Renamed Job"
+
+    client.delete(f"/jobs/{job_id}?confirm=true")
+    assert client.get(f"/jobs/{job_id}").status_code == 404
+
+
+def test_cache_stats_endpoint():
+    response = client.get("/admin/cache")
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_ratio", "entries"} <= response.json().keys()
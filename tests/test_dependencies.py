@@ -0,0 +1,203 @@
+import threading
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import engine
+from app.core.dependencies import DependencyTracker, find_cycle
+from app.jobs.registry import get_job_function, register_job
+from app.main import app
+from app.models.job import Job, JobStatus, job_dependencies
+
+client = TestClient(app)
+
+STEPS = []
+STEPS_LOCK = threading.Lock()
+
+
+@register_job("dag_step")
+def dag_step(job_id: str, job_metadata: dict = None):
+    started = time.monotonic()
+    time.sleep((job_metadata or {}).get("seconds", 0))
+    with STEPS_LOCK:
+        STEPS.append((job_metadata["step"], started, time.monotonic()))
+
+
+def create(step: str, depends_on=(), seconds: float = 0, **schedule):
+    payload = {
+        "name": f"DAG {step}",
+        "function_name": "dag_step",
+        "job_metadata": {"step": step, "seconds": seconds},
+        "depends_on": [job["id"] for job in depends_on],
+        **schedule,
+    }
+    response = client.post("/jobs", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def wait_for_steps(count: int, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while len(STEPS) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def diamond():
+    """a -> (b, c) -> d"""
+    STEPS.clear()
+    a = create("a", interval_seconds=3600)
+    b = create("b", depends_on=[a], seconds=0.3)
+    c = create("c", depends_on=[a], seconds=0.3)
+    d = create("d", depends_on=[b, c])
+    yield a, b, c, d
+    for job in (d, c, b, a):
+        client.delete(f"/jobs/{job['id']}?confirm=true")
+
+
+def test_find_cycle():
+    upstreams = {"b": {"a"}, "c": {"b"}}
+    assert find_cycle(upstreams, "a", {"c"}) == ["a", "c", "b", "a"]
+    assert find_cycle(upstreams, "a", {"a"}) == ["a", "a"]
+    assert find_cycle(upstreams, "d", {"c"}) == []
+
+
+def test_tracker_waits_for_every_upstream():
+    tracker = DependencyTracker()
+    upstreams = {"d": {"b", "c"}}
+
+    assert tracker.record_success("b", upstreams) == []
+    assert tracker.record_success("b", upstreams) == []
+    assert tracker.record_success("c", upstreams) == ["d"]
+    # Satisfaction starts over after a trigger
+    assert tracker.record_success("c", upstreams) == []
+
+    # d no longer depends on c; the stale success does not linger
+    assert tracker.record_success("b", {"d": {"b"}}) == ["d"]
+
+
+def test_downstream_jobs_run_after_upstream_success(diamond):
+    a, b, c, d = diamond
+    assert client.post(f"/jobs/{a['id']}/run").status_code == 202
+    wait_for_steps(4)
+
+    order = [step for step, _, _ in STEPS]
+    assert order[0] == "a"
+    assert sorted(order[1:3]) == ["b", "c"]
+    assert order[3] == "d"
+
+    # The two branches overlapped instead of running back to back
+    timings = {step: (start, end) for step, start, end in STEPS}
+    assert timings["c"][0] < timings["b"][1] and timings["b"][0] < timings["c"][1]
+    assert timings["d"][0] >= max(timings["b"][1], timings["c"][1])
+
+
+def test_failed_upstream_does_not_trigger_downstream():
+    STEPS.clear()
+    # A multiplier of None makes dummy_number_crunch raise after loading its row
+    upstream = client.post(
+        "/jobs",
+        json={
+            "name": "Failing upstream",
+            "function_name": "dummy_number_crunch",
+            "interval_seconds": 3600,
+            "job_metadata": {"multiplier": None},
+        },
+    ).json()
+    child = create("child", depends_on=[upstream])
+    try:
+        assert client.post(f"/jobs/{upstream['id']}/run").status_code == 202
+        deadline = time.monotonic() + 5
+        while client.get(f"/jobs/{upstream['id']}").json()["status"] != "failed" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.get(f"/jobs/{upstream['id']}").json()["status"] == "failed"
+
+        wait_for_steps(1, timeout=0.5)
+        assert STEPS == []
+    finally:
+        client.delete(f"/jobs/{child['id']}?confirm=true")
+        client.delete(f"/jobs/{upstream['id']}?confirm=true")
+
+
+def test_missing_job_row_is_a_failure():
+    with pytest.raises(LookupError):
+        get_job_function("dummy_number_crunch")(job_id=str(uuid.uuid4()))
+
+
+def test_dependencies_written_elsewhere_are_honoured():
+    # As if another worker added the edge: nothing in this process hears about it
+    STEPS.clear()
+    upstream = create("upstream", interval_seconds=3600)
+    downstream = create("downstream", interval_seconds=3600, status="paused")
+    with engine.begin() as conn:
+        conn.execute(
+            job_dependencies.insert().values(
+                job_id=uuid.UUID(downstream["id"]), depends_on_id=uuid.UUID(upstream["id"])
+            )
+        )
+        conn.execute(
+            Job.__table__.update().where(Job.id == uuid.UUID(downstream["id"])).values(status=JobStatus.ACTIVE)
+        )
+    try:
+        assert client.post(f"/jobs/{upstream['id']}/run").status_code == 202
+        wait_for_steps(2)
+        assert [step for step, _, _ in STEPS] == ["upstream", "downstream"]
+    finally:
+        client.delete(f"/jobs/{downstream['id']}?confirm=true")
+        client.delete(f"/jobs/{upstream['id']}?confirm=true")
+
+
+def test_job_reports_its_dependencies(diamond):
+    a, b, c, d = diamond
+    assert d["depends_on"] == sorted([b["id"], c["id"]])
+    assert client.get(f"/jobs/{d['id']}").json()["depends_on"] == d["depends_on"]
+    listed = {job["id"]: job for job in client.get("/jobs").json()}
+    assert listed[b["id"]]["depends_on"] == [a["id"]]
+    assert listed[a["id"]]["depends_on"] == []
+
+
+def test_dependency_graph(diamond):
+    a, b, c, d = diamond
+    graph = client.get(f"/jobs/{b['id']}/graph").json()
+
+    assert {node["id"] for node in graph["nodes"]} == {a["id"], b["id"], d["id"]}
+    assert {(e["upstream"], e["downstream"]) for e in graph["edges"]} == {
+        (a["id"], b["id"]),
+        (b["id"], d["id"]),
+    }
+
+    full = client.get(f"/jobs/{a['id']}/graph").json()
+    assert len(full["nodes"]) == 4
+    assert len(full["edges"]) == 4
+
+
+def test_cycles_are_rejected(diamond):
+    a, b, c, d = diamond
+    response = client.patch(f"/jobs/{a['id']}", json={"depends_on": [d["id"]]})
+    assert response.status_code == 400
+    assert "cycle" in response.json()["detail"]
+
+    assert client.patch(f"/jobs/{b['id']}", json={"depends_on": [b["id"]]}).status_code == 400
+
+
+def test_unknown_dependency_is_rejected():
+    response = client.post(
+        "/jobs",
+        json={"name": "Orphan", "function_name": "dag_step", "depends_on": [str(uuid.uuid4())]},
+    )
+    assert response.status_code == 400
+
+
+def test_job_without_schedule_needs_dependencies():
+    response = client.post("/jobs", json={"name": "Nothing", "function_name": "dag_step"})
+    assert response.status_code == 422
+
+
+def test_deleting_upstream_updates_downstream(diamond):
+    a, b, c, d = diamond
+    assert client.get(f"/jobs/{d['id']}").json()["depends_on"]  # cached now
+
+    client.delete(f"/jobs/{c['id']}?confirm=true")
+    assert client.get(f"/jobs/{d['id']}").json()["depends_on"] == [b["id"]]
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.events import CursorExpiredError, EventBus, SubscriberDroppedError, event_bus
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def short_streams(monkeypatch):
+    monkeypatch.setattr(settings, "EVENTS_MAX_STREAM_SECONDS", 0.3)
+    monkeypatch.setattr(settings, "EVENTS_KEEPALIVE_SECONDS", 0.1)
+
+
+def parse_sse(body: str) -> list:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "data" in fields:
+            events.append({"id": fields.get("id"), "event": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+
+def test_subscriber_receives_matching_events_only():
+    bus = EventBus()
+
+    async def scenario():
+        subscription = bus.subscribe(types={"job.updated"}, job_id="a")
+        bus.publish("job.created", "a")
+        bus.publish("job.updated", "b")
+        bus.publish("job.updated", "a", {"name": "x"})
+        return await subscription.next(timeout=1), await subscription.next(timeout=0.01)
+
+    event, nothing = asyncio.run(scenario())
+    assert event["offset"] == 3
+    assert event["data"] == {"name": "x"}
+    assert nothing is None
+
+
+def test_resume_replays_buffered_events_after_cursor():
+    bus = EventBus(buffer_size=3)
+    for i in range(5):
+        bus.publish("job.created", str(i))
+
+    async def scenario():
+        subscription = bus.subscribe(after=3)
+        return [(await subscription.next(timeout=1))["offset"] for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [4, 5]
+
+    async def too_old():
+        bus.subscribe(after=1)
+
+    with pytest.raises(CursorExpiredError):
+        asyncio.run(too_old())
+
+
+def test_slow_subscriber_is_dropped():
+    bus = EventBus(subscriber_queue_size=2)
+
+    async def scenario():
+        subscription = bus.subscribe()
+        for i in range(3):
+            bus.publish("job.created", str(i))
+        with pytest.raises(SubscriberDroppedError):
+            await subscription.next(timeout=1)
+
+    asyncio.run(scenario())
+    assert bus.stats()["subscribers"] == 0
+    assert bus.stats()["dropped_subscribers"] == 1
+
+
+def test_publish_from_another_thread_wakes_subscriber():
+    bus = EventBus()
+
+    async def scenario():
+        subscription = bus.subscribe()
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, bus.publish, "job.deleted", "a")
+        return await subscription.next(timeout=2)
+
+    assert asyncio.run(scenario())["type"] == "job.deleted"
+
+
+def test_event_stream_reports_job_lifecycle(short_streams):
+    cursor = event_bus.last_offset
+    job = client.post(
+        "/jobs",
+        json={"name": "Evented", "function_name": "print_hello", "interval_seconds": 60, "status": "paused"},
+    ).json()
+    client.patch(f"/jobs/{job['id']}", json={"name": "Evented 2"})
+    client.delete(f"/jobs/{job['id']}?confirm=true")
+
+    response = client.get(f"/events?after={cursor}&job_id={job['id']}")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(response.text)
+    assert [e["event"] for e in events] == ["job.created", "job.updated", "job.deleted"]
+    assert events[1]["data"]["data"]["name"] == "Evented 2"
+    assert int(events[0]["id"]) > cursor
+
+    # Resuming from the last seen id skips what was already delivered
+    resumed = client.get(f"/events?job_id={job['id']}", headers={"Last-Event-ID": events[1]["id"]})
+    assert [e["event"] for e in parse_sse(resumed.text)] == ["job.deleted"]
+
+
+def test_event_stream_reports_queued_execution(short_streams):
+    job = client.post(
+        "/jobs",
+        json={"name": "Run me", "function_name": "print_hello", "interval_seconds": 60, "status": "paused"},
+    ).json()
+    cursor = event_bus.last_offset
+    assert client.post(f"/jobs/{job['id']}/run").status_code == 202
+
+    deadline = time.monotonic() + 2
+    while event_bus.last_offset == cursor and time.monotonic() < deadline:
+        time.sleep(0.01)
+    events = parse_sse(client.get(f"/events?after={cursor}&types=job.executed").text)
+
+    assert events[0]["data"]["job_id"] == job["id"]
+    assert events[0]["data"]["data"]["source"] == "queue"
+    client.delete(f"/jobs/{job['id']}?confirm=true")
+
+
+def test_event_stream_rejects_unknown_types():
+    assert client.get("/events?types=job.exploded").status_code == 400
+
+
+def test_event_stream_reports_failed_registered_job(short_streams):
+    # dummy_number_crunch marks its row failed itself; the run must still be published as job.failed
+    job = client.post(
+        "/jobs",
+        json={
+            "name": "Broken",
+            "function_name": "dummy_number_crunch",
+            "interval_seconds": 60,
+            "status": "paused",
+            "job_metadata": {"multiplier": None},
+        },
+    ).json()
+    cursor = event_bus.last_offset
+    assert client.post(f"/jobs/{job['id']}/run").status_code == 202
+
+    deadline = time.monotonic() + 2
+    while event_bus.last_offset == cursor and time.monotonic() < deadline:
+        time.sleep(0.01)
+    events = parse_sse(client.get(f"/events?after={cursor}&job_id={job['id']}").text)
+
+    assert [e["event"] for e in events] == ["job.failed"]
+    assert "NoneType" in events[0]["data"]["data"]["error"]
+    assert client.get(f"/jobs/{job['id']}").json()["status"] == "failed"
+    client.delete(f"/jobs/{job['id']}?confirm=true")
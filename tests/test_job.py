@@ -1,13 +1,18 @@
+import time
 import uuid
+from datetime import datetime, timedelta, timezone
 
+import msgpack
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import text
 
 from app.core.database import get_db
 from app.core.scheduler import scheduler_manager
+from app.jobs.registry import register_job
 from app.main import app
 from app.models.job import Job
+from app.schemas.job import JobRead, serialize_job
 
 client = TestClient(app)
 
@@ -250,4 +255,108 @@ def test_delete_all_jobs(create_job_payload, create_cron_job_payload):
     assert response.status_code == 200
     jobs = response.json()
     assert isinstance(jobs, list)
-    assert len(jobs) == 0
\ No newline at end of file
+    assert len(jobs) == 0
+
+def test_list_jobs_msgpack(create_job_payload):
+    client.post("/jobs", json=create_job_payload)
+    response = client.get("/jobs", headers={"Accept": "application/msgpack"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    jobs = msgpack.unpackb(response.content)
+    assert isinstance(jobs, list)
+    assert jobs == client.get("/jobs").json()
+
+
+def test_get_job_accept_negotiation(create_job_payload):
+    job_id = client.post("/jobs", json=create_job_payload).json()["id"]
+
+    response = client.get(f"/jobs/{job_id}", headers={"Accept": "application/json, application/msgpack;q=0.5"})
+    assert response.headers["content-type"] == "application/json"
+
+    response = client.get(f"/jobs/{job_id}", headers={"Accept": "application/x-msgpack"})
+    assert msgpack.unpackb(response.content)["id"] == job_id
+
+
+def test_serialize_job_matches_response_schema(create_job_payload):
+    job_id = client.post("/jobs", json=create_job_payload).json()["id"]
+    db = next(get_db())
+    try:
+        job = db.query(Job).filter(Job.id == uuid.UUID(job_id)).first()
+        assert serialize_job(job) == JobRead.model_validate(job).model_dump(mode="json")
+    finally:
+        db.close()
+
+
+RUN_CALLS = []
+
+
+@register_job("record_run")
+def record_run(job_id: str, job_metadata: dict = None):
+    RUN_CALLS.append((job_id, job_metadata))
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_one_shot_job_runs_once_and_completes():
+    payload = {
+        "name": "One Shot",
+        "function_name": "record_run",
+        "run_at": datetime.now(timezone.utc).isoformat(),
+        "job_metadata": {"text": "once"},
+    }
+    response = client.post("/jobs", json=payload)
+    assert response.status_code == 200
+    job_id = response.json()["id"]
+    assert response.json()["run_at"] is not None
+
+    assert wait_for(lambda: client.get(f"/jobs/{job_id}").json()["status"] == "completed")
+    assert [call for call in RUN_CALLS if call[0] == job_id] == [(job_id, {"text": "once"})]
+    assert client.get(f"/jobs/{job_id}").json()["next_run_at"] is None
+
+
+def test_future_one_shot_job_can_be_cancelled():
+    payload = {
+        "name": "Later",
+        "function_name": "record_run",
+        "run_at": (datetime.now(timezone.utc) + timedelta(seconds=0.3)).isoformat(),
+    }
+    job_id = client.post("/jobs", json=payload).json()["id"]
+    client.delete(f"/jobs/{job_id}?confirm=true")
+
+    time.sleep(0.5)
+    assert all(call[0] != job_id for call in RUN_CALLS)
+
+
+def test_schedule_fields_are_mutually_exclusive():
+    payload = {
+        "name": "Both",
+        "function_name": "record_run",
+        "interval_seconds": 5,
+        "run_at": datetime.now(timezone.utc).isoformat(),
+    }
+    assert client.post("/jobs", json=payload).status_code == 422
+
+
+def test_run_job_now(create_job_payload):
+    payload = dict(create_job_payload, function_name="record_run", status="paused")
+    job_id = client.post("/jobs", json=payload).json()["id"]
+
+    response = client.post(f"/jobs/{job_id}/run")
+    assert response.status_code == 202
+    assert response.json() == {"job_id": job_id, "status": "queued"}
+    assert wait_for(lambda: any(call[0] == job_id for call in RUN_CALLS))
+
+    # Out-of-schedule runs leave the job as it was
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "paused"
+
+
+def test_run_job_now_unknown_job():
+    assert client.post(f"/jobs/{uuid.uuid4()}/run").status_code == 404
+    assert client.post("/jobs/not-a-uuid/run").status_code == 400
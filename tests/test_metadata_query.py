@@ -0,0 +1,76 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select, text
+
+from app.core.metadata_query import ensure_metadata_indexes, metadata_filter_clauses
+from app.main import app
+from app.models.job import Base, Job, JobStatus
+
+client = TestClient(app)
+
+
+def create_job(metadata: dict) -> str:
+    payload = {
+        "name": "Metadata Job",
+        "function_name": "print_hello",
+        "interval_seconds": 60,
+        "job_metadata": metadata,
+        "status": "paused",
+    }
+    return client.post("/jobs", json=payload).json()["id"]
+
+
+def test_filter_jobs_by_indexed_key():
+    tenant = f"tenant-{uuid.uuid4().hex[:8]}"
+    wanted = create_job({"tenant": tenant, "tag": "nightly"})
+    create_job({"tenant": tenant, "tag": "hourly"})
+    create_job({"tenant": "someone-else", "tag": "nightly"})
+
+    response = client.get("/jobs", params={"meta.tenant": tenant, "meta.tag": "nightly"})
+    assert response.status_code == 200
+    assert [job["id"] for job in response.json()] == [wanted]
+
+
+def test_filter_jobs_by_unindexed_key_and_number():
+    marker = uuid.uuid4().hex
+    wanted = create_job({"marker": marker, "multiplier": 7})
+    create_job({"marker": marker, "multiplier": 8})
+
+    response = client.get("/jobs", params={"meta.marker": marker, "meta.multiplier": "7"})
+    assert [job["id"] for job in response.json()] == [wanted]
+
+
+def test_invalid_metadata_key():
+    response = client.get("/jobs", params={"meta.bad key": "x"})
+    assert response.status_code == 400
+
+
+def test_sqlite_lookup_uses_generated_column_index():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    ensure_metadata_indexes(engine, ["tenant"])
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Job.__table__),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "name": f"Job {i}",
+                    "function_name": "print_hello",
+                    "interval_seconds": 60,
+                    "job_metadata": {"tenant": f"t{i % 100}"},
+                    "status": JobStatus.ACTIVE,
+                }
+                for i in range(2000)
+            ],
+        )
+
+        stmt = select(Job.__table__).where(
+            *metadata_filter_clauses("sqlite", {"tenant": "t42"}, ["tenant"])
+        )
+        assert len(conn.execute(stmt).all()) == 20
+
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+        assert "USING INDEX ix_jobs_meta_tenant" in plan
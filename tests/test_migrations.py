@@ -0,0 +1,194 @@
+import io
+import uuid
+from datetime import datetime
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+
+import app.models.lease  # noqa: F401  (registers scheduler_leases on Base.metadata)
+from app.core.config import settings
+from app.core.metadata_query import ensure_metadata_indexes
+from app.core.migrations import alembic_config, include_object, run_migrations
+from app.models.job import Base, Job, JobStatus
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, stmt) -> str:
+    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+
+def seed(engine, count: int = 500):
+    with Session(engine) as db:
+        for i in range(count):
+            db.add(
+                Job(
+                    name=f"Job {i}",
+                    function_name=f"func_{i % 10}",
+                    interval_seconds=60,
+                    job_metadata={},
+                    status=JobStatus.ACTIVE if i % 5 == 0 else JobStatus.PAUSED,
+                )
+            )
+        db.commit()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def test_migrations_create_hot_query_indexes(engine):
+    run_migrations(engine)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("jobs")}
+    assert {
+        "ix_jobs_status",
+        "ix_jobs_next_run_at",
+        "ix_jobs_function_name",
+        "ix_jobs_active_next_run_at",
+    } <= indexes
+
+
+def test_load_existing_jobs_query_uses_index(engine):
+    run_migrations(engine)
+    seed(engine)
+    plan = query_plan(engine, select(Job).where(Job.status == JobStatus.ACTIVE))
+    assert plan.startswith("SEARCH jobs USING INDEX")
+
+
+def test_due_active_jobs_use_partial_index(engine):
+    run_migrations(engine)
+    seed(engine)
+    stmt = select(Job).where(
+        Job.status == JobStatus.ACTIVE, Job.next_run_at <= datetime(2100, 1, 1)
+    )
+    assert "USING INDEX ix_jobs_active_next_run_at" in query_plan(engine, stmt)
+
+
+def test_function_name_lookup_uses_index(engine):
+    run_migrations(engine)
+    seed(engine)
+    plan = query_plan(engine, select(Job).where(Job.function_name == "func_3"))
+    assert "ix_jobs_function_name" in plan
+
+
+def test_primary_key_lookup_on_binary_uuid(engine):
+    run_migrations(engine)
+    seed(engine, count=10)
+    with Session(engine) as db:
+        job = db.query(Job).first()
+        assert db.get(Job, job.id).name == job.name
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT DISTINCT typeof(id), length(id) FROM jobs")).all() == [("blob", 16)]
+        plan = " ".join(
+            row[-1]
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE id = ?", (job.id.bytes,))
+        )
+    assert "USING INDEX sqlite_autoindex_jobs_1" in plan
+
+
+def test_legacy_hex_ids_are_converted(engine):
+    job_id = uuid.uuid4()
+    with engine.begin() as conn:
+        # Schema as produced by Base.metadata.create_all before migrations existed
+        conn.execute(text(
+            "CREATE TABLE jobs (id CHAR(32) NOT NULL PRIMARY KEY, name VARCHAR NOT NULL, "
+            "interval_seconds INTEGER, cron_expression VARCHAR, function_name VARCHAR NOT NULL, "
+            "last_run_at DATETIME, next_run_at DATETIME, job_metadata JSON, "
+            "status VARCHAR(6) NOT NULL)"
+        ))
+        conn.execute(
+            text("INSERT INTO jobs (id, name, interval_seconds, function_name, job_metadata, status) "
+                 "VALUES (:id, 'Legacy', 30, 'print_hello', '{}', 'ACTIVE')"),
+            {"id": job_id.hex},
+        )
+
+    run_migrations(engine)
+
+    with Session(engine) as db:
+        job = db.get(Job, job_id)
+        assert job is not None
+        assert job.name == "Legacy"
+
+
+def test_migrated_schema_matches_models(engine):
+    # What `alembic check` does: autogenerate against head must find nothing to do
+    run_migrations(engine)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"compare_type": True, "include_object": include_object(conn.dialect.name)}
+        )
+        assert compare_metadata(context, Base.metadata) == []
+
+
+def test_schema_check_ignores_what_startup_adds(engine):
+    run_migrations(engine)
+    ensure_metadata_indexes(engine, ["tenant"])
+    SQLAlchemyJobStore(engine=engine).start(None, "default")
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"compare_type": True, "include_object": include_object(conn.dialect.name)}
+        )
+        assert compare_metadata(context, Base.metadata) == []
+
+
+def test_postgres_metadata_index_is_a_migration(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://scheduler@localhost/scheduler")
+    config = alembic_config()
+    config.output_buffer = io.StringIO()
+    command.upgrade(config, "0006:0007", sql=True)
+    sql = config.output_buffer.getvalue()
+    assert "ALTER TABLE jobs ALTER COLUMN job_metadata TYPE JSONB USING job_metadata::jsonb" in sql
+    assert "CREATE INDEX IF NOT EXISTS ix_jobs_job_metadata_gin ON jobs USING gin (job_metadata jsonb_path_ops)" in sql
+
+
+def test_uuid_columns_are_blobs(engine):
+    run_migrations(engine)
+    for table, column in (("jobs", "id"), ("job_dependencies", "job_id"), ("job_dependencies", "depends_on_id")):
+        columns = {c["name"]: c for c in inspect(engine).get_columns(table)}
+        assert str(columns[column]["type"]) == "BLOB"
+
+
+def test_status_column_fits_completed(engine):
+    run_migrations(engine)
+    status = {column["name"]: column for column in inspect(engine).get_columns("jobs")}["status"]
+    assert status["type"].length >= len("COMPLETED")
+
+
+def test_dependency_tables_and_relaxed_schedule_check(engine):
+    run_migrations(engine)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("job_dependencies")}
+    assert "ix_job_dependencies_depends_on_id" in indexes
+
+    with Session(engine) as db:
+        upstream = Job(name="Upstream", function_name="func", interval_seconds=60, job_metadata={})
+        downstream = Job(name="Downstream", function_name="func", job_metadata={})
+        downstream.upstream_jobs = [upstream]
+        db.add_all([upstream, downstream])
+        db.commit()
+        assert db.get(Job, downstream.id).depends_on == [upstream.id]
+
+
+def test_dependency_migration_downgrades(engine):
+    run_migrations(engine)
+    with Session(engine) as db:
+        db.add(Job(name="Triggered only", function_name="func", job_metadata={}))
+        db.commit()
+
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "0005")
+
+    assert not inspect(engine).has_table("job_dependencies")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM jobs")).scalar() == 0
@@ -0,0 +1,160 @@
+import pstats
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.profiling import ProfilerBusyError, SamplingProfiler, job_profiler, stage
+from app.jobs.registry import JOB_REGISTRY, register_job
+from app.main import app
+
+client = TestClient(app)
+
+
+@register_job("profiled_sleeper")
+def profiled_sleeper(job_id: str, job_metadata: dict = None):
+    with stage("nap"):
+        time.sleep(0.01)
+
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture(autouse=True)
+def reset_profiles():
+    yield
+    job_profiler.disable("profiled_sleeper")
+    job_profiler.reset()
+
+
+def test_sampling_profiler_sees_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        stacks = SamplingProfiler().capture(0.1, interval=0.002)
+    finally:
+        stop.set()
+        worker.join()
+
+    busy = [stack for stack in stacks if stack.startswith("busy-worker;")]
+    assert busy
+    assert any("test_profiling:busy_loop" in stack for stack in busy)
+
+
+def test_only_one_capture_at_a_time():
+    profiler = SamplingProfiler()
+    capturing = threading.Thread(target=profiler.capture, args=(0.3,))
+    capturing.start()
+    time.sleep(0.05)
+    with pytest.raises(ProfilerBusyError):
+        profiler.capture(0.1)
+    capturing.join()
+
+
+def test_stage_timings_recorded_without_cprofile():
+    JOB_REGISTRY["profiled_sleeper"](job_id="x")
+
+    summary = client.get("/admin/profile/jobs").json()["profiled_sleeper"]
+    assert summary["cprofile"] is False
+    assert summary["has_pstats"] is False
+    assert summary["stages"]["nap"]["count"] == 1
+    assert summary["stages"]["total"]["max_seconds"] >= summary["stages"]["nap"]["max_seconds"]
+
+
+def test_cprofile_opt_in_and_pstats_download(tmp_path):
+    assert client.put("/admin/profile/jobs/profiled_sleeper").json()["cprofile"] is True
+    for i in range(3):
+        JOB_REGISTRY["profiled_sleeper"](job_id=str(i))
+
+    response = client.get("/admin/profile/jobs/profiled_sleeper/pstats")
+    assert response.status_code == 200
+    path = tmp_path / "profiled_sleeper.pstats"
+    path.write_bytes(response.content)
+    stats = pstats.Stats(str(path))
+    calls = {func[2]: stat[1] for func, stat in stats.stats.items()}
+    assert calls["profiled_sleeper"] == 3
+
+    assert "profiled_sleeper" in client.get("/admin/profile/jobs/profiled_sleeper/pstats?format=text").text
+
+    client.delete("/admin/profile/jobs/profiled_sleeper")
+    assert client.get("/admin/profile/jobs/profiled_sleeper/pstats").status_code == 404
+
+
+def test_overlapping_profiled_runs_do_not_fail():
+    job_profiler.enable("profiled_gate")
+    entered = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def gate(job_id: str, job_metadata: dict = None):
+        if job_id == "first":
+            entered.set()
+            release.wait(2)
+        return job_id
+
+    def run(job_id: str):
+        results.append(job_profiler.run("profiled_gate", gate, job_id=job_id))
+
+    first = threading.Thread(target=run, args=("first",))
+    first.start()
+    assert entered.wait(2)
+    try:
+        # Only one cProfile may be active at a time; the overlapping run goes unprofiled
+        run("second")
+    finally:
+        release.set()
+        first.join()
+
+    assert sorted(results) == ["first", "second"]
+    summary = job_profiler.summary()["profiled_gate"]
+    assert summary["cprofile_skipped"] == 1
+    assert summary["stages"]["total"]["count"] == 2
+    assert summary["has_pstats"] is True
+    job_profiler.disable("profiled_gate")
+
+
+def test_profiler_errors_never_fail_the_job(monkeypatch):
+    class BrokenProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", BrokenProfile)
+    job_profiler.enable("profiled_sleeper")
+
+    JOB_REGISTRY["profiled_sleeper"](job_id="x")
+
+    summary = job_profiler.summary()["profiled_sleeper"]
+    assert summary["cprofile_skipped"] == 1
+    assert summary["stages"]["nap"]["count"] == 1
+
+
+def test_dummy_number_crunch_reports_stages():
+    job = client.post(
+        "/jobs",
+        json={"name": "Staged", "function_name": "dummy_number_crunch", "interval_seconds": 60, "status": "paused"},
+    ).json()
+    JOB_REGISTRY["dummy_number_crunch"](job_id=job["id"], job_metadata={"multiplier": 2})
+
+    stages = client.get("/admin/profile/jobs").json()["dummy_number_crunch"]["stages"]
+    assert {"db_fetch", "work", "commit", "log", "total"} <= stages.keys()
+    client.delete(f"/jobs/{job['id']}?confirm=true")
+
+
+def test_sample_endpoint_returns_collapsed_stacks():
+    response = client.get("/admin/profile/sample?seconds=0.05&interval_ms=5")
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+    line = response.text.splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+    assert client.get("/admin/profile/sample?seconds=3600").status_code == 400
+
+
+def test_unknown_function_cannot_be_profiled():
+    assert client.put("/admin/profile/jobs/not_a_job").status_code == 404
@@ -0,0 +1,153 @@
+import subprocess
+import sys
+import textwrap
+import uuid
+from datetime import datetime, timedelta, timezone
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+
+from app.core.config import settings
+from app.core.migrations import run_migrations
+from app.core.scheduler import SchedulerManager, scheduler_manager
+from app.jobs.registry import (
+    JOB_ENTRY_POINT_GROUP,
+    JOB_REGISTRY,
+    JobNotAllowedError,
+    LazyJobRef,
+    discover_jobs,
+    get_job_function,
+    run_registered_job,
+)
+from app.main import app
+from app.models.job import Job
+
+client = TestClient(app)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# What app.main may spend on top of importing the frameworks it is built on (measured ~0.15s)
+IMPORT_BUDGET_SECONDS = 0.5
+FRAMEWORK_MODULES = (
+    "fastapi.responses",
+    "sqlalchemy.orm",
+    "alembic.command",
+    "apscheduler.schedulers.background",
+    "apscheduler.jobstores.sqlalchemy",
+    "pydantic_settings",
+    "orjson",
+    "msgpack",
+)
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in seconds per module, measured in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_job_plugin.py").write_text(textwrap.dedent("""
+        CALLS = []
+
+        def crunch(job_id, job_metadata=None):
+            CALLS.append(job_id)
+            return len(CALLS)
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_job_plugin"
+    sys.modules.pop("lazy_job_plugin", None)
+    JOB_REGISTRY.pop("plugin_crunch", None)
+
+
+def test_app_startup_does_not_import_job_modules(record_property):
+    times = import_times("app.main")
+    framework_times = import_times(", ".join(FRAMEWORK_MODULES))
+    overhead = times["app.main"] - sum(framework_times[module] for module in FRAMEWORK_MODULES)
+    record_property("app_main_import_seconds", round(times["app.main"], 3))
+    record_property("app_main_import_overhead_seconds", round(overhead, 3))
+
+    assert "app.jobs.builtin" not in times
+    assert "app.jobs.registry" in times
+    assert overhead < IMPORT_BUDGET_SECONDS
+
+
+def test_entry_point_job_is_imported_on_first_run(plugin_module):
+    plugin = EntryPoint(name="plugin_crunch", value=f"{plugin_module}:crunch", group=JOB_ENTRY_POINT_GROUP)
+    discover_jobs(functions={}, plugins=[plugin])
+
+    ref = JOB_REGISTRY["plugin_crunch"]
+    assert isinstance(ref, LazyJobRef)
+    assert plugin_module not in sys.modules
+
+    assert run_registered_job("plugin_crunch", job_id="j1") == 1
+    assert plugin_module in sys.modules
+    assert sys.modules[plugin_module].CALLS == ["j1"]
+    # Resolved once; later runs skip the reference
+    assert not isinstance(JOB_REGISTRY["plugin_crunch"], LazyJobRef)
+    assert JOB_REGISTRY["plugin_crunch"](job_id="j2") == 2
+
+
+def test_configured_functions_override_entry_points(plugin_module):
+    plugin = EntryPoint(name="plugin_crunch", value="missing_module:crunch", group=JOB_ENTRY_POINT_GROUP)
+    discover_jobs(functions={"plugin_crunch": f"{plugin_module}:crunch"}, plugins=[plugin])
+    assert JOB_REGISTRY["plugin_crunch"].target == f"{plugin_module}:crunch"
+
+
+def test_allowlist_limits_what_this_worker_runs(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_WORKER_ALLOWLIST", ["print_hello"])
+    assert get_job_function("print_hello")
+    with pytest.raises(JobNotAllowedError):
+        get_job_function("dummy_number_crunch")
+
+    job = client.post(
+        "/jobs",
+        json={"name": "Elsewhere", "function_name": "dummy_number_crunch", "interval_seconds": 60},
+    ).json()
+    try:
+        # Known to the API, but neither scheduled nor run here
+        assert scheduler_manager.scheduler.get_job(job["id"]) is None
+        assert client.post(f"/jobs/{job['id']}/run").status_code == 409
+    finally:
+        client.delete(f"/jobs/{job['id']}?confirm=true")
+
+
+def test_worker_groups_keep_separate_job_stores(tmp_path, monkeypatch):
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'groups.db'}")
+    run_migrations(db_engine)
+    monkeypatch.setattr(settings, "SCHEDULER_ENGINE", "apscheduler")
+    next_run_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    job = Job(
+        id=uuid.uuid4(), name="Hello", function_name="print_hello", interval_seconds=3600, next_run_at=next_run_at
+    )
+
+    managers = {}
+    for group, allowlist in (("hello", ["print_hello"]), ("crunch", ["dummy_number_crunch"])):
+        monkeypatch.setattr(settings, "SCHEDULER_LEASE_NAME", group)
+        monkeypatch.setattr(settings, "JOB_WORKER_ALLOWLIST", allowlist)
+        managers[group] = SchedulerManager(db_engine)
+        managers[group].start()
+        managers[group].add_job(job)
+    try:
+        assert [j.id for j in managers["hello"].scheduler.get_jobs()] == [str(job.id)]
+        assert managers["crunch"].scheduler.get_jobs() == []
+        assert {"apscheduler_jobs_hello", "apscheduler_jobs_crunch"} <= set(inspect(db_engine).get_table_names())
+    finally:
+        for manager in managers.values():
+            manager.shutdown(timeout=1)
+        db_engine.dispose()
@@ -0,0 +1,231 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.migrations import run_migrations
+from app.core.scheduler import SchedulerManager, StoppableBackgroundScheduler
+from app.jobs.registry import register_job, run_registered_job
+from app.models.job import Job
+
+STARTED = threading.Event()
+RELEASE = threading.Event()
+FINISHED = []
+PROBED = []
+
+
+@register_job("lease_probe_job")
+def lease_probe_job(job_id: str, job_metadata: dict = None):
+    PROBED.append((job_id, job_metadata["kind"]))
+
+
+@register_job("slow_drain_job")
+def slow_drain_job(job_id: str, job_metadata: dict = None):
+    STARTED.set()
+    RELEASE.wait(timeout=(job_metadata or {}).get("seconds", 5))
+    FINISHED.append(job_id)
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'shutdown.db'}")
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def reset_events():
+    STARTED.clear()
+    RELEASE.clear()
+    FINISHED.clear()
+    yield
+
+
+def test_shutdown_waits_for_in_flight_run(db_engine):
+    manager = SchedulerManager(db_engine)
+    manager.start()
+    manager.run_now("job-1", "slow_drain_job", {"seconds": 0.5})
+    assert STARTED.wait(timeout=2)
+
+    started = time.monotonic()
+    assert manager.shutdown(timeout=5) is True
+    elapsed = time.monotonic() - started
+
+    assert FINISHED == ["job-1"]
+    assert 0.3 < elapsed < 2
+
+
+def test_shutdown_stops_at_deadline(db_engine):
+    manager = SchedulerManager(db_engine)
+    manager.start()
+    manager.run_now("job-1", "slow_drain_job", {"seconds": 10})
+    assert STARTED.wait(timeout=2)
+
+    started = time.monotonic()
+    assert manager.shutdown(timeout=0.3) is False
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1
+    assert FINISHED == []
+
+    # Let the abandoned run finish so it cannot leak into later tests
+    RELEASE.set()
+    deadline = time.monotonic() + 2
+    while not FINISHED and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_shutdown_does_not_dispatch_pending_runs(db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "READY_QUEUE_MAX_WORKERS", 1)
+    manager = SchedulerManager(db_engine)
+    manager.start()
+    manager.run_now("job-1", "slow_drain_job", {"seconds": 0.2})
+    manager.run_now("job-2", "slow_drain_job", {"seconds": 0.2})
+    assert STARTED.wait(timeout=2)
+
+    assert manager.shutdown(timeout=5) is True
+    assert FINISHED == ["job-1"]
+    assert len(manager.ready_queue) == 1
+
+
+def test_lease_hands_over_on_shutdown(db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_LEASE_POLL_SECONDS", 0.05)
+    primary = SchedulerManager(db_engine)
+    standby = SchedulerManager(db_engine)
+    primary.start()
+    standby.start()
+    try:
+        assert primary.lease.held
+        assert not standby.lease.held
+
+        primary.shutdown(timeout=1)
+        deadline = time.monotonic() + 2
+        while not standby.lease.held and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert standby.lease.held
+    finally:
+        standby.shutdown(timeout=1)
+
+
+@pytest.mark.parametrize("engine_name", ["apscheduler", "timing_wheel"])
+def test_only_lease_holder_keeps_in_memory_jobs(db_engine, monkeypatch, engine_name):
+    monkeypatch.setattr(settings, "SCHEDULER_LEASE_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "SCHEDULER_ENGINE", engine_name)
+    now = datetime.now(timezone.utc)
+    run_at = now + timedelta(hours=1)
+    with Session(db_engine) as db:
+        one_shot = Job(name="Later", function_name="slow_drain_job", run_at=run_at, next_run_at=run_at, job_metadata={})
+        interval = Job(name="Hourly", function_name="slow_drain_job", interval_seconds=3600, next_run_at=run_at, job_metadata={})
+        db.add_all([one_shot, interval])
+        db.commit()
+        one_shot_id, interval_id = str(one_shot.id), str(interval.id)
+
+    primary = SchedulerManager(db_engine)
+    standby = SchedulerManager(db_engine)
+    primary.start()
+    standby.start()
+    try:
+        for manager in (primary, standby):
+            with Session(db_engine) as db:
+                manager.load_existing_jobs(db)
+        assert len(primary.ready_queue) == 1
+        assert len(standby.ready_queue) == 0
+        if engine_name == "timing_wheel":
+            assert standby.scheduler.get_job(interval_id) is None
+
+        # The standby loads them from the DB when it takes over
+        primary.shutdown(timeout=1)
+        deadline = time.monotonic() + 2
+        while not len(standby.ready_queue) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert standby.lease.held
+        assert standby.ready_queue.cancel(one_shot_id)
+        assert standby.scheduler.get_job(interval_id) is not None
+    finally:
+        standby.shutdown(timeout=1)
+
+
+@pytest.mark.parametrize("engine_name", ["apscheduler", "timing_wheel"])
+def test_leader_runs_jobs_written_through_standby(db_engine, monkeypatch, engine_name):
+    monkeypatch.setattr(settings, "SCHEDULER_ENGINE", engine_name)
+    monkeypatch.setattr(settings, "SCHEDULER_LEASE_TTL_SECONDS", 0.3)
+    PROBED.clear()
+    primary = SchedulerManager(db_engine)
+    standby = SchedulerManager(db_engine)
+    primary.start()
+    standby.start()
+    try:
+        assert primary.lease.held and not standby.lease.held
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+        with Session(db_engine) as db:
+            interval = Job(
+                name="Every second", function_name="lease_probe_job", interval_seconds=1,
+                job_metadata={"kind": "interval"},
+            )
+            one_shot = Job(
+                name="Soon", function_name="lease_probe_job", run_at=run_at, job_metadata={"kind": "one-shot"},
+            )
+            db.add_all([interval, one_shot])
+            db.commit()
+            # What the API does on the worker that received the request
+            standby.add_job(interval)
+            standby.add_job(one_shot)
+            interval_id, one_shot_id = str(interval.id), str(one_shot.id)
+
+        deadline = time.monotonic() + 4
+        while {job_id for job_id, _ in PROBED} != {interval_id, one_shot_id} and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert {job_id for job_id, _ in PROBED} == {interval_id, one_shot_id}
+        assert len(standby.ready_queue) == 0
+    finally:
+        standby.shutdown(timeout=1)
+        primary.shutdown(timeout=1)
+
+
+def test_restart_keeps_interval_phase(db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_ENGINE", "timing_wheel")
+    PROBED.clear()
+    with Session(db_engine) as db:
+        daily = Job(name="Daily", function_name="lease_probe_job", interval_seconds=86400, job_metadata={"kind": "daily"})
+        # As persisted by the previous process: due in a moment, not a day from now
+        daily.next_run_at = datetime.now(timezone.utc) + timedelta(seconds=0.3)
+        db.add(daily)
+        db.commit()
+        daily_id = str(daily.id)
+
+    manager = SchedulerManager(db_engine)
+    manager.start()
+    try:
+        with Session(db_engine) as db:
+            manager.load_existing_jobs(db)
+        deadline = time.monotonic() + 3
+        while not PROBED and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert PROBED == [(daily_id, "daily")]
+    finally:
+        manager.shutdown(timeout=1)
+
+
+def test_stopping_standby_leaves_shared_job_store_alone(db_engine):
+    scheduler = StoppableBackgroundScheduler(jobstores={"default": SQLAlchemyJobStore(engine=db_engine)})
+    scheduler.start(paused=True)
+    # Due now: the lease holder's run, sitting in the store a standby shares
+    due = datetime.now(timezone.utc) - timedelta(seconds=1)
+    scheduler.add_job(
+        run_registered_job,
+        trigger=IntervalTrigger(hours=1, timezone=timezone.utc),
+        id="due",
+        next_run_time=due,
+        kwargs={"function_name": "lease_probe_job", "job_id": "due", "job_metadata": {"kind": "due"}},
+    )
+    # A plain BackgroundScheduler runs one more pass here and advances the run it never submitted
+    scheduler.shutdown(wait=True)
+
+    assert SQLAlchemyJobStore(engine=db_engine).lookup_job("due").next_run_time == due
@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import create_db_engine, engine
+from app.core.sqlite_writer import DirectWriter, SQLiteWriter, writer_for
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    db_engine = create_db_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    with db_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE counters (name TEXT PRIMARY KEY, value INTEGER)"))
+    yield db_engine
+    db_engine.dispose()
+
+
+def insert(name, value=0):
+    def operation(conn):
+        conn.execute(text("INSERT INTO counters VALUES (:name, :value)"), {"name": name, "value": value})
+        return name
+    return operation
+
+
+def names(db_engine):
+    with db_engine.connect() as conn:
+        return sorted(row[0] for row in conn.execute(text("SELECT name FROM counters")))
+
+
+def test_connections_use_wal_and_pragmas():
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+
+def test_concurrent_writes_are_group_committed(db_engine):
+    writer = SQLiteWriter(db_engine, max_batch=64, max_delay=0.01)
+    try:
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(lambda i: writer.execute(insert(f"c{i:03d}")), range(200)))
+    finally:
+        writer.close()
+
+    assert sorted(results) == names(db_engine)
+    assert len(results) == 200
+    assert writer.operations == 200
+    assert writer.commits < 200
+
+
+def test_failed_operation_rolls_back_only_itself(db_engine):
+    writer = SQLiteWriter(db_engine, max_batch=10, max_delay=0.05)
+    entered = threading.Event()
+    gate = threading.Event()
+
+    def blocker(conn):
+        entered.set()
+        gate.wait(timeout=5)
+
+    def broken(conn):
+        insert("half-done")(conn)
+        raise RuntimeError("boom")
+
+    try:
+        writer.submit(blocker)
+        assert entered.wait(timeout=5)
+        # Everything queued while the writer is busy lands in the next batch
+        futures = [writer.submit(insert("a")), writer.submit(broken), writer.submit(insert("b"))]
+        gate.set()
+
+        assert futures[0].result(timeout=5) == "a"
+        with pytest.raises(RuntimeError):
+            futures[1].result(timeout=5)
+        assert futures[2].result(timeout=5) == "b"
+    finally:
+        writer.close()
+
+    assert names(db_engine) == ["a", "b"]
+    assert writer.commits == 2
+
+
+def test_close_commits_queued_writes(db_engine):
+    writer = SQLiteWriter(db_engine, max_delay=0.05)
+    futures = [writer.submit(insert(f"q{i}")) for i in range(5)]
+    writer.close()
+
+    assert all(f.done() for f in futures)
+    assert names(db_engine) == [f"q{i}" for i in range(5)]
+    assert not writer.running
+
+
+def test_writer_for_shares_one_writer_per_sqlite_engine(db_engine):
+    assert writer_for(db_engine) is writer_for(db_engine)
+    assert isinstance(writer_for(db_engine), SQLiteWriter)
+    assert isinstance(DirectWriter(db_engine).execute(insert("direct")), str)
+    writer_for(db_engine).close()
@@ -0,0 +1,157 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from apscheduler.events import EVENT_JOB_EXECUTED
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.core.timing_wheel import HierarchicalTimingWheel, TimingWheelScheduler
+
+
+def drain(wheel, to_tick):
+    """Advance one tick at a time and record the tick each key expired on."""
+    fired = {}
+    while wheel.current_tick < to_tick:
+        tick = wheel.current_tick + 1
+        for key, _ in wheel.advance(tick):
+            fired[key] = tick
+    return fired
+
+
+def test_wheel_fires_each_key_on_its_tick():
+    wheel = HierarchicalTimingWheel(slots=8, levels=3)
+    # Spread deadlines across every level, including the overflow beyond 8 ** 3
+    deadlines = {f"job-{t}": t for t in (1, 5, 7, 8, 9, 63, 64, 65, 200, 511, 512, 700)}
+    for key, tick in deadlines.items():
+        wheel.schedule(key, tick)
+
+    assert len(wheel) == len(deadlines)
+    assert drain(wheel, 800) == deadlines
+    assert len(wheel) == 0
+
+
+def test_wheel_cancel_and_reschedule():
+    wheel = HierarchicalTimingWheel(slots=8, levels=2)
+    wheel.schedule("a", 10)
+    wheel.schedule("b", 10)
+    wheel.schedule("c", 3)
+
+    assert wheel.cancel("b") is True
+    assert wheel.cancel("b") is False
+    wheel.schedule("c", 40)
+
+    assert "b" not in wheel
+    assert drain(wheel, 50) == {"a": 10, "c": 40}
+
+
+def test_wheel_overdue_key_fires_on_next_advance():
+    wheel = HierarchicalTimingWheel(slots=8, levels=2, start_tick=100)
+    wheel.schedule("late", 50)
+    assert wheel.advance(101) == [("late", None)]
+
+
+def test_wheel_jump_collects_everything_due():
+    wheel = HierarchicalTimingWheel(slots=16, levels=3)
+    for tick in range(1, 1000, 7):
+        wheel.schedule(tick, tick)
+    expired = wheel.advance(500)
+    assert sorted(key for key, _ in expired) == list(range(1, 500, 7))
+    assert len(wheel) == len(range(505, 1000, 7))
+
+
+def test_scheduler_conflicting_and_missing_ids():
+    scheduler = TimingWheelScheduler()
+    trigger = IntervalTrigger(seconds=60, timezone=timezone.utc)
+    scheduler.add_job(print, trigger=trigger, id="job")
+
+    with pytest.raises(ConflictingIdError):
+        scheduler.add_job(print, trigger=trigger, id="job")
+    scheduler.add_job(print, trigger=trigger, id="job", replace_existing=True)
+
+    scheduler.remove_job("job")
+    assert scheduler.get_job("job") is None
+    with pytest.raises(JobLookupError):
+        scheduler.remove_job("job")
+
+
+def test_scheduler_runs_jobs_and_persists_next_run():
+    persisted = []
+    executed = []
+    done = threading.Event()
+
+    def work(job_id):
+        executed.append(job_id)
+        if len(executed) >= 3:
+            done.set()
+
+    scheduler = TimingWheelScheduler(tick_seconds=0.01, on_reschedule=persisted.extend)
+    listener_events = []
+    scheduler.add_listener(listener_events.append, EVENT_JOB_EXECUTED)
+    scheduler.start()
+    try:
+        scheduler.add_job(
+            work,
+            trigger=IntervalTrigger(seconds=0.05, timezone=timezone.utc),
+            id="recurring",
+            kwargs={"job_id": "recurring"},
+        )
+        scheduler.add_job(
+            work,
+            trigger=DateTrigger(datetime.now(timezone.utc) + timedelta(seconds=0.02)),
+            id="once",
+            kwargs={"job_id": "once"},
+        )
+        assert done.wait(5)
+    finally:
+        scheduler.shutdown()
+
+    assert "once" in executed
+    assert executed.count("recurring") >= 2
+    assert scheduler.get_job("once") is None
+    assert ("once", None) in persisted
+    assert any(job_id == "recurring" and next_run for job_id, next_run in persisted)
+    assert {event.job_id for event in listener_events} == {"once", "recurring"}
+
+
+def test_scheduler_resumes_from_given_next_run_time():
+    persisted = []
+    fired = threading.Event()
+    scheduler = TimingWheelScheduler(tick_seconds=0.01, on_reschedule=persisted.extend)
+    scheduler.start()
+    try:
+        overdue = datetime.now(timezone.utc) - timedelta(hours=1)
+        scheduler.add_job(
+            fired.set,
+            trigger=IntervalTrigger(days=1, timezone=timezone.utc),
+            id="daily",
+            next_run_time=overdue,
+        )
+        # Overdue runs fire on the next tick instead of waiting a whole interval
+        assert fired.wait(1)
+    finally:
+        scheduler.shutdown()
+
+    # The phase is kept: the next run is a day after the persisted one, not a day from now
+    assert scheduler.get_job("daily").next_run_time == overdue + timedelta(days=1)
+
+
+def test_scheduler_skips_fire_while_instance_running():
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(time.monotonic())
+        release.wait(5)
+
+    scheduler = TimingWheelScheduler(tick_seconds=0.01, job_defaults={"max_instances": 1})
+    scheduler.start()
+    try:
+        scheduler.add_job(slow, trigger=IntervalTrigger(seconds=0.02, timezone=timezone.utc), id="slow")
+        time.sleep(0.2)
+        assert len(calls) == 1
+    finally:
+        release.set()
+        scheduler.shutdown()